@@ -54,12 +54,6 @@ Claude Code integration (autorun plugin):
     context compaction to restore previous context inline.
 """
 
-try:
-    from importlib.metadata import version
-    __version__ = version("ai_session_tools")
-except Exception:
-    __version__ = "0.3.1"
-
 __author__ = "Andrew Hundt"
 
 # Primary entry point - AISession is the main class
@@ -160,3 +154,20 @@ __all__ = [
 ]
 # Protocol types (Searchable, Extractable, Filterable, Storage, Predicate, Composable)
 # are importable from ai_session_tools.types for custom implementors.
+
+
+def __getattr__(name: str):
+    """Resolve ``__version__`` on first access (PEP 562).
+
+    importlib.metadata is one of the slowest imports on the CLI start-up path and
+    only ``aise --version`` needs it, so it is not imported at package load.
+    """
+    if name == "__version__":
+        try:
+            from importlib.metadata import version
+            value = version("ai_session_tools")
+        except Exception:
+            value = "0.3.1"
+        globals()["__version__"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
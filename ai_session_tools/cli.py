@@ -28,6 +28,10 @@ from collections import defaultdict
 from typer.core import TyperGroup, HAS_RICH
 import typer.rich_utils as _ru
 
+# Not deferred into _get_engine(): any relative import here runs the package
+# __init__, which already imports engine, so a lazy import would save nothing.
+# Option help strings live in module-level typer.Option constants (_OPT_*) and
+# are built once at import, not per invocation.
 from .engine import SessionRecoveryEngine, _check_redos_safe, _is_skill_injection
 from .formatters import MessageFormatter, get_formatter
 from .models import FileVersion, FilterSpec
@@ -1190,8 +1194,8 @@ def _get_engine(projects_dir: Optional[str] = None, recovery_dir: Optional[str]
         if recovery_dir is None:
             recovery_dir = str(base / "recovery")
 
-    # expanduser() so that env var values like "~/.claude/projects" work correctly
-    return SessionRecoveryEngine(Path(projects_dir).expanduser(), Path(recovery_dir).expanduser())
+    # SessionRecoveryEngine expands ~, so env var values like "~/.claude/projects" work
+    return SessionRecoveryEngine(Path(projects_dir), Path(recovery_dir))
 
 
 # ── Shared helper functions ───────────────────────────────────────────────────
@@ -1345,12 +1349,24 @@ def _resolve_output_path(target: Path) -> Path:
     if not target.exists():
         return target
     stem, suffix = target.stem, target.suffix
-    candidate = target.parent / f"{stem}.recovered{suffix}"
+    # One directory listing instead of a stat per probe: the first free slot is
+    # found in memory, still the smallest unused number even when there are gaps.
+    # Names are compared lowercased so a case-insensitive filesystem (macOS) can
+    # never hand back a name that exists under different casing.
+    try:
+        taken = {name.lower() for name in os.listdir(target.parent)}
+    except OSError:  # unreadable listing: fall back to probing each name
+        taken = None
+
+    def is_taken(name: str) -> bool:
+        return name.lower() in taken if taken is not None else (target.parent / name).exists()
+
+    candidate_name = f"{stem}.recovered{suffix}"
     counter = 1
-    while candidate.exists():
-        candidate = target.parent / f"{stem}.recovered_{counter}{suffix}"
+    while is_taken(candidate_name):
+        candidate_name = f"{stem}.recovered_{counter}{suffix}"
         counter += 1
-    return candidate
+    return target.parent / candidate_name
 
 
 def _do_extract(  # noqa: C901
@@ -12,16 +12,21 @@ import datetime
 import fnmatch
 import functools
 import glob as _glob_module
+import itertools
 import json
 import os
 import re
-from collections import defaultdict
+import sys
+from collections import defaultdict, deque
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Set
 
 if TYPE_CHECKING:
     from .filters import SearchFilter
 
+# Every JSONL record in this module is decoded through _json_loads.  orjson is a
+# declared dependency, so the stdlib branch only covers broken installs; there is
+# no ujson tier in between, as it would never be reached in a normal install.
 try:
     from orjson import loads as _json_loads
 except ImportError:
@@ -253,6 +258,11 @@ _SLASH_CMD_DISCOVERY_RE = re.compile(r"^/(\w[\w:.-]*)(?=\s|$)")
 #: Fast timestamp extraction from raw JSONL lines (avoids json.loads for --after-timestamp).
 _TS_EXTRACT_RE = re.compile(r'"timestamp"\s*:\s*"([^"]+)"')
 
+#: Recovery version snapshot name suffix: <filename>_v<version_num>_line_<line_count>.txt
+_VERSION_FILE_RE = re.compile(r"_v(\d+)_line_(\d+)\.txt$")
+#: Full version snapshot name, capturing the original filename ("cli.py_v000001_line_10.txt" → "cli.py").
+_VERSION_NAME_RE = re.compile(r"(.+?)_v\d+_line_\d+\.txt$")
+
 #: Extract slash command from Claude Code's XML tag format:
 #: <command-name>/ar:plannew</command-name>
 #: Returns the command name (e.g. "/ar:plannew") from the XML tag.
@@ -348,6 +358,224 @@ def _check_redos_safe(pattern: str) -> None:
     _check_nested(parsed)
 
 
+#: Characters that make a search query a regex (or glob) rather than a literal.
+#: Unlike re.escape(), spaces, "-" and "#" do not count, so "two words" stays literal.
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
+#: Characters a required literal may contain for the raw-line pre-filter in
+#: search_messages.  Limited to printable ASCII that JSON writes unescaped; " and \
+#: are escaped in the raw line, a space may be where _extract_content() joined two
+#: text blocks, and i/s match non-ASCII letters under re.IGNORECASE (\u0130, \u0131,
+#: \u017f) that str.lower() does not fold back to ASCII.
+_RAW_LITERAL_CHARS = frozenset(chr(c) for c in range(0x21, 0x7F)) - frozenset('"\\iIsS')
+
+
+def _longest_raw_query_run(query_lower: str) -> Optional[str]:
+    """Longest piece of a lowercased literal query that must appear in the raw line.
+
+    The query is matched against _extract_content(), which joins text blocks with
+    a space, so a phrase may straddle two blocks in the raw JSON; quotes are escaped
+    there too.  Splitting on whitespace, " and non-ASCII keeps only pieces that sit
+    verbatim inside one JSON string.  Both sides are lowercased, so unlike
+    _RAW_LITERAL_CHARS i and s are safe here.
+    """
+    runs = "".join(c if "!" <= c <= "~" and c not in '"\\' else " " for c in query_lower).split()
+    return max(runs, key=len) if runs else None
+
+
+def _longest_literal_run(items) -> Optional[str]:
+    """Longest run of consecutive _RAW_LITERAL_CHARS literals in a parsed sequence.
+
+    Groups are inlined into the sequence; anything optional, repeated or
+    alternated ends the current run.  Returns None if re's parser internals are unavailable.
+    """
+    try:
+        from re import _constants as _c  # type: ignore[attr-defined]  # Python 3.11+
+    except ImportError:
+        return None
+
+    runs: list[str] = []
+    run: list[str] = []
+
+    def walk(seq) -> None:
+        for op, av in seq:
+            if op is _c.LITERAL and chr(av) in _RAW_LITERAL_CHARS:
+                run.append(chr(av))
+            elif op is _c.SUBPATTERN:
+                walk(av[3])
+            elif op is _c.ATOMIC_GROUP:
+                walk(av)
+            elif run:
+                runs.append("".join(run))
+                run.clear()
+
+    walk(items)
+    if run:
+        runs.append("".join(run))
+    return max(runs, key=len).lower() if runs else None
+
+
+@functools.lru_cache(maxsize=128)
+def _required_literals(regex: str) -> Optional[tuple[str, ...]]:
+    """Return lowercased literals of which every match of ``regex`` contains at least one.
+
+    A pattern that is a top-level alternation (``foo|bar|baz``, optionally wrapped in
+    a group) yields one literal per branch, so a multi-term query is checked with a
+    few substring tests per line instead of a parse.  Any other pattern yields a
+    1-tuple with its longest literal run.  Returns None when no such literal exists
+    (e.g. a branch has none) or the pattern cannot be parsed, so callers fall back
+    to a full parse.  Also None if re's parser internals (Python 3.11+) are unavailable.
+    """
+    try:
+        from re import _constants as _c  # type: ignore[attr-defined]
+        from re import _parser
+    except ImportError:
+        return None
+
+    try:
+        items = list(_parser.parse(regex))
+    except (re.error, RecursionError):
+        return None
+    while len(items) == 1 and items[0][0] is _c.SUBPATTERN:
+        items = list(items[0][1][3])
+    if len(items) == 1 and items[0][0] is _c.BRANCH:
+        branches: list[str] = []
+        for branch in items[0][1][1]:
+            literal = _longest_literal_run(branch)
+            if literal is None:
+                return None
+            branches.append(literal)
+        return tuple(branches)
+    literal = _longest_literal_run(items)
+    return (literal,) if literal else None
+
+
+def _loads_line_bytes(line: bytes):
+    """Parse one raw JSONL line straight from bytes.
+
+    orjson parses bytes without a separate decode step.  It rejects invalid UTF-8,
+    so such lines are retried with replacement characters, matching what text-mode
+    reads with ``errors="replace"`` produced.  Raises ValueError on malformed JSON.
+    """
+    try:
+        return _json_loads(line)
+    except ValueError:
+        return _json_loads(line.decode("utf-8", errors="replace"))
+
+
+#: Read buffer for whole-file JSONL scans.  Session files run to hundreds of MB, and
+#: the default 8 KiB buffer means one read() syscall per 8 KiB; 1 MiB cuts that
+#: ~128-fold while the per-line loop stays unchanged.  Lines are iterated straight
+#: off this buffer, so a scan holds one line at a time, never a whole-file copy.
+_JSONL_READ_BUFFER = 1 << 20
+
+
+#: Leading bytes inspected by _looks_binary() before a JSONL file is read line by line.
+_BINARY_SNIFF_BYTES = 64
+
+
+def _looks_binary(raw) -> bool:
+    """Return True if a binary file handle starts with a NUL byte in its first bytes.
+
+    Session JSONL is UTF-8 text and never contains NUL, so such a file is skipped
+    before any line is decoded or parsed.  Uses ``peek()``, which does not consume
+    input, so the caller can iterate the same handle afterwards.
+    """
+    return b"\x00" in raw.peek(_BINARY_SNIFF_BYTES)[:_BINARY_SNIFF_BYTES]
+
+
+def _scan_version_dirs(recovery_dir: str) -> tuple[str, ...]:
+    """Paths of ``session_all_versions_*`` dirs directly under ``recovery_dir``.
+
+    One scandir pass using the entry's cached d_type instead of a stat per child.
+    Returns () when the directory is missing or unreadable.
+    """
+    try:
+        with os.scandir(recovery_dir) as it:
+            return tuple(
+                entry.path for entry in it
+                if entry.name.startswith("session_all_versions_") and entry.is_dir()
+            )
+    except OSError:
+        return ()
+
+
+#: search_messages scans files on a thread pool only once the queued files total at
+#: least this many bytes.  Threads overlap the read() syscalls, which release the
+#: GIL, but orjson parsing and the per-line matching hold it, so on a warm page
+#: cache the pool is no faster: 8 files / 114 MB measured 0-30% slower threaded.
+#: Only corpora too large to stay cached spend enough time in I/O wait to gain.
+_PARALLEL_SCAN_MIN_BYTES = 256 << 20
+
+#: search_messages only considers the thread pool (and only then stats the files to
+#: total their size) when at least this many files are queued; a handful of files
+#: is always scanned sequentially, without the extra stat() per file.
+_PARALLEL_SCAN_MIN_FILES = 8
+
+#: Upper bound on scan threads; past a few, workers just queue on the GIL.
+_PARALLEL_SCAN_MAX_WORKERS = 4
+
+
+def _total_size_at_least(paths: list, limit: int) -> bool:
+    """True if the files in ``paths`` sum to at least ``limit`` bytes (stops early)."""
+    total = 0
+    for path in paths:
+        try:
+            total += os.stat(path).st_size
+        except OSError:
+            continue
+        if total >= limit:
+            return True
+    return False
+
+
+def _scan_files(paths: list, fn: Callable) -> Iterator:
+    """Yield ``fn(path)`` for each path, in order.
+
+    When there are _PARALLEL_SCAN_MIN_FILES or more files totalling
+    _PARALLEL_SCAN_MIN_BYTES or more, the calls run on a small thread pool so
+    reads of one file overlap parsing of another; results are still yielded in
+    input order, so callers see the same sequence as a plain loop.  Work is
+    submitted lazily, at most one file per worker ahead of the consumer, so a
+    caller that stops early leaves the rest unread; closing the generator
+    cancels queued files instead of waiting for them.
+    """
+    if len(paths) < _PARALLEL_SCAN_MIN_FILES or not _total_size_at_least(paths, _PARALLEL_SCAN_MIN_BYTES):
+        yield from map(fn, paths)
+        return
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = min(len(paths), _PARALLEL_SCAN_MAX_WORKERS)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    todo = iter(paths)
+    try:
+        pending = deque(pool.submit(fn, path) for path in itertools.islice(todo, workers))
+        while pending:
+            result = pending.popleft().result()
+            for path in itertools.islice(todo, 1):
+                pending.append(pool.submit(fn, path))
+            yield result
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_version_suffix(name: str, base_len: int) -> Optional[tuple[int, int]]:
+    """Parse (version_num, line_count) from ``<base>_v<N>_line_<M>.txt``.
+
+    ``base_len`` is the length of the known original filename, so the numbers are
+    sliced out with str.find instead of a regex per snapshot.  Names that do not fit
+    the fixed layout fall back to _VERSION_FILE_RE.
+    """
+    start = base_len + 2  # skip "<base>_v"
+    end = name.find("_line_", start)
+    if name.startswith("_v", base_len) and end != -1 and name.endswith(".txt"):
+        version, lines = name[start:end], name[end + 6:-4]
+        if version.isdigit() and lines.isdigit():
+            return int(version), int(lines)
+    match = _VERSION_FILE_RE.search(name)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
 def _passes_date_filter(ts: str, since: Optional[str], until: Optional[str]) -> bool:
     """Return True iff ISO timestamp ts falls within [since, until] (inclusive).
 
@@ -559,11 +787,31 @@ class SessionRecoveryEngine:
             recovery_dir: Path to recovery output directory
                           (default: ~/.claude/recovery). Contains session_*/ subdirs
                           with extracted source files and version history.
+
+        Both paths are ``~``-expanded once here, so every method works with the
+        same normalized Path and callers may pass e.g. ``"~/.claude/projects"``.
         """
-        self.projects_dir = Path(projects_dir)
-        self.recovery_dir = Path(recovery_dir)
+        self.projects_dir = Path(projects_dir).expanduser()
+        self.recovery_dir = Path(recovery_dir).expanduser()
         self._file_cache: Dict[str, SessionFile] = {}
         self._version_cache: Dict[str, List[FileVersion]] = {}
+        # get_original_path() results keyed by filename (None = not found).
+        self._original_path_cache: Dict[str, Optional[str]] = {}
+
+    def clear_cache(self) -> None:
+        """Forget every memoized listing and scan so the next call re-reads disk.
+
+        The JSONL tool-call scan, per-file info and versions, the version-dir
+        listing and get_original_path() lookups are cached for the engine's lifetime.  A
+        long-lived engine (e.g. behind AISession) calls this to pick up recovery
+        files and Write/Edit calls made since those caches were filled.
+        """
+        self._file_cache.clear()
+        self._version_cache.clear()
+        self._original_path_cache.clear()
+        # cached_property values live in the instance __dict__
+        self.__dict__.pop("_version_dirs", None)
+        self.__dict__.pop("_file_tool_calls", None)
 
     # ── Project name helpers ─────────────────────────────────────────────────
 
@@ -640,21 +888,22 @@ class SessionRecoveryEngine:
                 until_iso = _u[1] if isinstance(_u, tuple) else _u
             except (ValueError, AttributeError, TypeError):
                 pass  # invalid until → no first-line pre-filter; per-record filter still applies
-        for project_dir in self.projects_dir.glob("*"):
-            if not project_dir.is_dir():
-                continue
+        if project_filter:
+            pf_raw = project_filter.lower()
+            pf_norm = pf_raw.replace("_", "-")        # ai_session_tools → ai-session-tools
+        for project_entry in self._iter_project_dirs():
             if project_filter:
-                pf_raw = project_filter.lower()
-                pf_norm = pf_raw.replace("_", "-")        # ai_session_tools → ai-session-tools
-                decoded = self.extract_project_name(project_dir.name).lower()
-                encoded = project_dir.name.lower()
+                decoded = self.extract_project_name(project_entry.name).lower()
+                encoded = project_entry.name.lower()
                 if pf_norm not in encoded and pf_raw not in decoded and pf_norm not in decoded:
                     continue
-            for jsonl_file in project_dir.glob("*.jsonl"):
-                # Session scope filter
-                if session_id_prefix and not jsonl_file.stem.startswith(session_id_prefix):
+            for jsonl_file in self._iter_jsonl_in(project_entry.path, session_id_prefix or ""):
+                # One stat() call for both mtime and birthtime, and only when a date
+                # pre-filter needs them: plain enumeration (e.g. get_statistics()
+                # counting sessions) does no per-file I/O at all.
+                if not (since_iso or until_iso):
+                    yield project_entry.name, jsonl_file, False
                     continue
-                # One stat() call for both mtime and birthtime
                 mtime_iso, birthtime_iso = _path_stat_iso(jsonl_file)
                 # since: mtime < since → all messages too old → skip (no I/O)
                 if since_iso and mtime_iso and not _passes_date_filter(mtime_iso, since_iso, None):
@@ -673,7 +922,51 @@ class SessionRecoveryEngine:
                             continue  # confirmed: all messages after until → skip
                 # Per-record hint: mtime < until → all records ≤ mtime < until
                 skip_until_check = bool(until_iso and mtime_iso and mtime_iso < until_iso)
-                yield project_dir.name, jsonl_file, skip_until_check
+                yield project_entry.name, jsonl_file, skip_until_check
+
+    def _iter_session_jsonl_files(self, session_id: str) -> Iterator[tuple]:
+        """Yield (project_dir_name, jsonl_path) for files whose name starts with session_id.
+
+        Session files are named ``{session_id}.jsonl``, so a prefix ID is matched
+        against directory listings alone: no glob translation, no stat, and no
+        file is opened unless its name matches.
+        """
+        for project_entry in self._iter_project_dirs():
+            for jsonl_file in self._iter_jsonl_in(project_entry.path, session_id):
+                yield project_entry.name, jsonl_file
+
+    def _iter_project_dirs(self) -> Iterator[os.DirEntry]:
+        """Yield a DirEntry per project directory under projects_dir.
+
+        One scandir pass; is_dir() uses the entry's cached d_type.  Like pathlib's
+        glob("*"), dot-prefixed directories are included.
+        """
+        try:
+            projects_it = os.scandir(self.projects_dir)
+        except OSError:
+            return
+        with projects_it:
+            for project_entry in projects_it:
+                if project_entry.is_dir():
+                    yield project_entry
+
+    @staticmethod
+    def _iter_jsonl_in(project_dir: str, prefix: str = "") -> Iterator[Path]:
+        """Yield ``*.jsonl`` paths in project_dir whose name starts with prefix.
+
+        Names are filtered with str.startswith/endswith on the listing, so nothing
+        is stat'ed or opened here.  Like pathlib's glob("*.jsonl"), dot-prefixed
+        names are included.
+        """
+        try:
+            files_it = os.scandir(project_dir)
+        except OSError:
+            return
+        with files_it:
+            for entry in files_it:
+                name = entry.name
+                if name.endswith(".jsonl") and name.startswith(prefix):
+                    yield Path(entry.path)
 
     def _find_session_files(self, session_id: str) -> List[tuple]:
         """Return all (jsonl_path, project_dir_name) tuples for the given session ID prefix.
@@ -683,13 +976,12 @@ class SessionRecoveryEngine:
         so callers that need a single session can use matches[0].
         """
         matches = []
-        for project_dir_name, jsonl_path, _ in self._iter_all_jsonl():
-            if jsonl_path.stem.startswith(session_id):
-                try:
-                    mtime = jsonl_path.stat().st_mtime
-                except OSError:
-                    mtime = 0.0
-                matches.append((mtime, jsonl_path, project_dir_name))
+        for project_dir_name, jsonl_path in self._iter_session_jsonl_files(session_id):
+            try:
+                mtime = jsonl_path.stat().st_mtime
+            except OSError:
+                mtime = 0.0
+            matches.append((mtime, jsonl_path, project_dir_name))
         # Sort newest first, then strip the mtime sort key
         matches.sort(key=lambda x: x[0], reverse=True)
         return [(path, proj) for _mtime, path, proj in matches]
@@ -701,7 +993,7 @@ class SessionRecoveryEngine:
         Handles OSError (permission denied, missing file) by returning nothing.
         """
         try:
-            with open(path, encoding="utf-8", errors="replace") as f:
+            with open(path, encoding="utf-8", errors="replace", buffering=_JSONL_READ_BUFFER) as f:
                 for line in f:
                     try:
                         data = _json_loads(line)
@@ -714,20 +1006,42 @@ class SessionRecoveryEngine:
 
     # ── End private helpers ───────────────────────────────────────────────────
 
+    # cached_property is lock-free on Python 3.12+ and a non-data descriptor: after
+    # the first access the value sits in the instance __dict__ and lookups never
+    # reach the descriptor again, so a hand-rolled replacement would not be faster.
     @functools.cached_property
     def _version_dirs(self) -> List[Path]:
-        """Session all-versions dirs — scanned once per engine instance."""
-        if not self.recovery_dir.exists():
-            return []
-        return [
-            d for d in self.recovery_dir.iterdir()
-            if d.is_dir() and d.name.startswith("session_all_versions_")
-        ]
+        """Session all-versions dirs — scanned once per engine instance (see clear_cache())."""
+        return [Path(p) for p in _scan_version_dirs(str(self.recovery_dir))]
+
+    @functools.cached_property
+    def _file_tool_calls(self) -> List[tuple]:
+        """(tool, file_path, timestamp, session_id) for every file-writing tool call.
+
+        Scanned once per engine instance so repeated search() calls (e.g. a count
+        followed by a listing) do not re-read every JSONL file.  Tool names and
+        session IDs repeat on nearly every row, so they are interned.
+        """
+        calls = []
+        for call in self._iter_file_tool_calls(
+            filename="*",
+            session_id=None,
+            tools=("Edit", "Write", "NotebookEdit"),
+        ):
+            sid = call["session_id"]
+            if isinstance(sid, str):
+                sid = sys.intern(sid)
+            calls.append((sys.intern(call["tool"]), call["file_path"], call["timestamp"], sid))
+        return calls
 
     @staticmethod
+    @functools.lru_cache(maxsize=64)
     def _compile_pattern(pattern: str) -> re.Pattern:
         """Compile pattern, auto-detecting glob vs regex.
 
+        Memoized: repeated searches with the same pattern skip the ReDoS check
+        and regex compilation (invalid patterns raise and are not cached).
+
         Args:
             pattern: Glob pattern (e.g. '*.py') or regex (e.g. 'cli.*').
 
@@ -746,7 +1060,9 @@ class SessionRecoveryEngine:
         except re.error as exc:
             raise ValueError(f"Invalid search pattern {pattern!r}: {exc}") from exc
 
-    def _get_or_create_file_info(self, file_path: Path) -> Optional[SessionFile]:
+    def _get_or_create_file_info(
+        self, file_path: Path, stat: Optional[os.stat_result] = None
+    ) -> Optional[SessionFile]:
         """Get or create cached file info.
 
         Cache is keyed by filename (basename): across multiple session dirs the same
@@ -754,16 +1070,23 @@ class SessionRecoveryEngine:
         first-encountered copy; version history comes from get_versions() which scans
         all session_all_versions_*/ dirs.
 
+        Args:
+            file_path: File to describe.
+            stat: Stat result the caller already holds (e.g. from ``DirEntry.stat()``);
+                  ``file_path`` is only stat'ed when this is None.
+
         Returns:
             SessionFile, or None if the file's stat() call fails (e.g. broken symlink).
         """
         if file_path.name not in self._file_cache:
             try:
                 versions = self.get_versions(file_path.name)
-                stat = file_path.stat()
-                last_modified = datetime.datetime.fromtimestamp(
+                if stat is None:
+                    stat = file_path.stat()
+                mtime_dt = datetime.datetime.fromtimestamp(
                     stat.st_mtime, tz=datetime.timezone.utc
-                ).strftime("%Y-%m-%dT%H:%M:%S")
+                ).replace(tzinfo=None, microsecond=0)
+                last_modified = mtime_dt.isoformat()
                 created_date = datetime.datetime.fromtimestamp(
                     stat.st_ctime, tz=datetime.timezone.utc
                 ).strftime("%Y-%m-%dT%H:%M:%S")
@@ -771,13 +1094,15 @@ class SessionRecoveryEngine:
                     name=file_path.name,
                     path=str(file_path.resolve()),
                     location="recovery",
-                    file_type=file_path.suffix[1:] or "unknown",
+                    # Interned: a handful of extensions shared by every SessionFile.
+                    file_type=sys.intern(file_path.suffix[1:] or "unknown"),
                     sessions=[v.session_id for v in versions],
                     edits=len(versions),
                     size_bytes=stat.st_size,
                     last_modified=last_modified,
                     created_date=created_date,
                 )
+                self._file_cache[file_path.name]._last_modified_dt = mtime_dt
             except OSError:
                 return None
         return self._file_cache.get(file_path.name)
@@ -794,7 +1119,10 @@ class SessionRecoveryEngine:
         if not filters.matches_size(file_info.size_bytes):
             return False
 
-        if not filters.matches_datetime(file_info.last_modified):
+        if file_info._last_modified_dt is not None:
+            if not filters.matches_datetime_obj(file_info._last_modified_dt):
+                return False
+        elif not filters.matches_datetime(file_info.last_modified):
             return False
 
         # Session filter: apply include and exclude independently to mirror
@@ -804,10 +1132,10 @@ class SessionRecoveryEngine:
         # Files with no sessions fail include_sessions (they cannot satisfy inclusion)
         # but pass exclude_sessions (nothing to exclude matches).
         if filters.include_sessions:
-            if not any(s in filters.include_sessions for s in (file_info.sessions or [])):
+            if filters.include_sessions.isdisjoint(file_info.sessions or ()):
                 return False
         if filters.exclude_sessions:
-            if any(s in filters.exclude_sessions for s in (file_info.sessions or [])):
+            if not filters.exclude_sessions.isdisjoint(file_info.sessions or ()):
                 return False
 
         if not filters.matches_edits(file_info.edits):
@@ -842,8 +1170,9 @@ class SessionRecoveryEngine:
         # Compile first: raise ValueError on bad patterns before any I/O.
         pattern_re = self._compile_pattern(pattern)
 
-        results: List[SessionFile] = []
-        seen_names: Set[str] = set()
+        # Keyed by filename: the same name in several session_*/ dirs (or again in
+        # the JSONL scan) is deduplicated with one dict lookup, no post-pass.
+        results: Dict[str, SessionFile] = {}
 
         # Phase 1: Scan recovery_dir for Write-based files
         skip_phase1 = (
@@ -867,70 +1196,60 @@ class SessionRecoveryEngine:
                     if filters.exclude_sessions and session_id_str in filters.exclude_sessions:
                         continue
 
-                    session_dir = Path(entry.path)
-
-                    with os.scandir(session_dir) as it2:
+                    with os.scandir(entry.path) as it2:
                         for entry2 in it2:
                             if not entry2.is_file() or not pattern_re.search(entry2.name):
                                 continue
-                            if entry2.name in seen_names:
+                            if entry2.name in results:
                                 continue
 
-                            file_path = Path(entry2.path)
-
                             # Extension pre-filter: skip stat+get_versions for wrong extensions.
-                            ext = file_path.suffix.lstrip(".")
+                            # Works on the entry name; a Path is only built for files that pass.
+                            ext = os.path.splitext(entry2.name)[1].lstrip(".")
                             if not filters.matches_extension(ext):
                                 continue
 
                             # Stat pre-filter: check date/size before expensive get_versions.
+                            # The stat result is handed on so a cache miss below does not
+                            # stat the same file a second time.
+                            s = None
                             if filters.since or filters.until or filters.min_size or (filters.max_size is not None):
                                 try:
-                                    s = file_path.stat()
-                                    mtime = datetime.datetime.fromtimestamp(
-                                        s.st_mtime, tz=datetime.timezone.utc
-                                    ).strftime("%Y-%m-%dT%H:%M:%S")
-                                    if not filters.matches_datetime(mtime) or not filters.matches_size(s.st_size):
+                                    s = entry2.stat()
+                                    if not filters.matches_timestamp(s.st_mtime) or not filters.matches_size(s.st_size):
                                         continue
                                 except OSError:
                                     continue
 
-                            file_info = self._get_or_create_file_info(file_path)
+                            file_info = self._get_or_create_file_info(Path(entry2.path), s)
                             if file_info is None:
                                 continue
 
                             if self._apply_all_filters(file_info, filters):
-                                results.append(file_info)
-                                seen_names.add(file_path.name)
+                                results[entry2.name] = file_info
 
         # Phase 2: Scan JSONL for Edit/Write/NotebookEdit tool calls not in recovery_dir
         edit_files: dict[str, dict] = {}  # filename -> aggregated info
-        for call in self._iter_file_tool_calls(
-            filename="*",
-            session_id=None,
-            tools=("Edit", "Write", "NotebookEdit"),
-        ):
-            fname = Path(call["file_path"]).name
-            if fname in seen_names:
+        for tool_name, file_path, ts, call_sid in self._file_tool_calls:
+            fname = os.path.basename(file_path)
+            if fname in results:
                 continue
             if not pattern_re.search(fname):
                 continue
-            ext = Path(fname).suffix.lstrip(".")
+            ext = os.path.splitext(fname)[1].lstrip(".")
             if not filters.matches_extension(ext):
                 continue
-            ts = call.get("timestamp", "")
             if not filters.matches_datetime(ts):
                 continue
             if fname not in edit_files:
                 edit_files[fname] = {
                     "sessions": set(), "edits": 0,
-                    "first_ts": ts, "last_ts": ts, "path": call["file_path"],
+                    "first_ts": ts, "last_ts": ts, "path": file_path,
                     "write_count": 0, "edit_count": 0, "notebook_edit_count": 0,
                 }
             info = edit_files[fname]
-            info["sessions"].add(call["session_id"])
+            info["sessions"].add(call_sid)
             info["edits"] += 1
-            tool_name = call["tool"]
             if tool_name == "Write":
                 info["write_count"] += 1
             elif tool_name == "Edit":
@@ -949,7 +1268,7 @@ class SessionRecoveryEngine:
                 continue
             if filters.exclude_sessions and info["sessions"] & filters.exclude_sessions:
                 continue
-            results.append(SessionFile(
+            results[fname] = SessionFile(
                 name=fname,
                 path=info["path"],
                 edits=info["edits"],
@@ -959,10 +1278,32 @@ class SessionRecoveryEngine:
                 write_count=info["write_count"],
                 edit_count=info["edit_count"],
                 notebook_edit_count=info["notebook_edit_count"],
-            ))
-            seen_names.add(fname)
+            )
+
+        return sorted(results.values(), key=lambda f: f.edits, reverse=True)
+
+    def search_many(
+        self,
+        patterns: List[str],
+        filters: Optional[FilterSpec] = None,
+    ) -> Dict[str, List[SessionFile]]:
+        """Search files for several patterns with a single directory walk.
 
-        return sorted(results, key=lambda f: f.edits, reverse=True)
+        Equivalent to ``{p: self.search(p, filters) for p in patterns}``: search()
+        deduplicates by filename and applies filters independently of the pattern,
+        so each result is the ``"*"`` result narrowed by name, in the same order.
+
+        Raises:
+            ValueError: If any pattern is not a valid glob or regex (before any I/O).
+        """
+        if filters is None:
+            filters = FilterSpec()
+        compiled = {pattern: self._compile_pattern(pattern) for pattern in patterns}
+        everything = self.search("*", filters)
+        return {
+            pattern: [f for f in everything if pattern_re.search(f.name)]
+            for pattern, pattern_re in compiled.items()
+        }
 
     def get_versions(self, filename: str) -> List[FileVersion]:
         """Get all versions of a file across all sessions.
@@ -977,39 +1318,40 @@ class SessionRecoveryEngine:
             return self._version_cache[filename]
 
         versions = []
-        version_pattern = r"_v(\d+)_line_(\d+)\.txt$"
+        # Escape glob metacharacters ([, ], ?, *) in the filename so that
+        # filenames like "data[0].py" or "file?.py" produce valid glob patterns.
+        version_glob = f"{_glob_module.escape(filename)}_v*_line_*.txt"
+        # Track the newest Write snapshot while scanning instead of re-walking the list.
+        last_write: Optional[FileVersion] = None
 
         for session_dir in self._version_dirs:
-            # Escape glob metacharacters ([, ], ?, *) in the filename so that
-            # filenames like "data[0].py" or "file?.py" produce valid glob patterns.
-            escaped = _glob_module.escape(filename)
-            for version_file in session_dir.glob(f"{escaped}_v*_line_*.txt"):
-                match = re.search(version_pattern, version_file.name)
-                if match:
-                    version_num = int(match.group(1))
-                    line_count = int(match.group(2))
+            dir_session_id = sys.intern(session_dir.name.replace("session_all_versions_", ""))
+            for version_file in session_dir.glob(version_glob):
+                parsed = _parse_version_suffix(version_file.name, len(filename))
+                if parsed:
+                    version_num, line_count = parsed
                     try:
                         ts = datetime.datetime.fromtimestamp(
                             version_file.stat().st_mtime, tz=datetime.timezone.utc
                         ).strftime("%Y-%m-%d %H:%M")
                     except OSError:
                         ts = ""
-                    versions.append(
-                        FileVersion(
-                            filename=filename,
-                            version_num=version_num,
-                            line_count=line_count,
-                            session_id=session_dir.name.replace("session_all_versions_", ""),
-                            timestamp=ts,
-                        )
+                    fv = FileVersion(
+                        filename=filename,
+                        version_num=version_num,
+                        line_count=line_count,
+                        session_id=dir_session_id,
+                        timestamp=ts,
                     )
+                    versions.append(fv)
+                    if last_write is None or version_num > last_write.version_num:
+                        last_write = fv
 
         # Phase 2: Append Edit/NotebookEdit entries from JSONL
-        max_write_version = max((v.version_num for v in versions), default=0)
+        max_write_version = last_write.version_num if last_write else 0
         # Estimate running line count from last Write version or disk file
         running_line_count = 0
-        if versions:
-            last_write = max(versions, key=lambda v: v.version_num)
+        if last_write is not None:
             running_line_count = last_write.line_count
         else:
             orig = self.get_original_path(filename)
@@ -1064,6 +1406,11 @@ class SessionRecoveryEngine:
         self._version_cache[filename] = versions
         return versions
 
+    def _version_file_path(self, filename: str, v: FileVersion) -> Path:
+        """Snapshot path for one version in its session_all_versions_*/ dir."""
+        session_dir = self.recovery_dir / f"session_all_versions_{v.session_id}"
+        return session_dir / f"{filename}_v{v.version_num:06d}_line_{v.line_count}.txt"
+
     def _resolve_version_paths(
         self, filename: str,
     ) -> tuple:
@@ -1076,20 +1423,22 @@ class SessionRecoveryEngine:
         version_paths = []
         if versions:
             for v in sorted(versions):
-                session_dir = self.recovery_dir / f"session_all_versions_{v.session_id}"
-                vf = session_dir / f"{filename}_v{v.version_num:06d}_line_{v.line_count}.txt"
+                vf = self._version_file_path(filename, v)
                 if vf.exists():
                     version_paths.append((vf, v))
 
-        fallback = None
-        if not version_paths and self.recovery_dir.exists():
+        fallback = None if version_paths else self._find_fallback_path(filename)
+        return version_paths, fallback
+
+    def _find_fallback_path(self, filename: str) -> Optional[Path]:
+        """First copy of filename in a session_*/ dir, used when no snapshot exists."""
+        if self.recovery_dir.exists():
             for session_dir in self.recovery_dir.glob("session_*/"):
                 if "all_versions" not in session_dir.name:
                     fp = session_dir / filename
                     if fp.exists():
-                        fallback = fp
-                        break
-        return version_paths, fallback
+                        return fp
+        return None
 
     def extract_final(self, filename: str, output_dir: Path) -> Optional[Path]:
         """Extract the most recent version of a file (highest version number).
@@ -1101,8 +1450,19 @@ class SessionRecoveryEngine:
         Returns:
             Path to extracted file, or None if not found.
         """
-        version_paths, fallback = self._resolve_version_paths(filename)
-        source = version_paths[-1][0] if version_paths else fallback
+        source = None
+        # Newest first: stop at the first snapshot still on disk instead of
+        # checking every version the way extract_all() must.  sorted()[::-1]
+        # rather than sort(reverse=True): FileVersion orders by version_num only,
+        # so ties across sessions must resolve to the last one in ascending order,
+        # the same snapshot extract_all() writes last.
+        for v in sorted(self.get_versions(filename))[::-1]:
+            vf = self._version_file_path(filename, v)
+            if vf.exists():
+                source = vf
+                break
+        if source is None:
+            source = self._find_fallback_path(filename)
         if source is None:
             return None
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -1146,17 +1506,16 @@ class SessionRecoveryEngine:
             return MessageType.SYSTEM
 
     def _process_message_line(
-        self, line: str, session_id: str, message_type: Optional[str]
+        self, line: bytes, session_id: str, message_type: Optional[str]
     ) -> Optional[SessionMessage]:
-        """Process a single JSONL line into a SessionMessage.
+        """Process a single raw JSONL line into a SessionMessage.
 
+        Takes the undecoded bytes so orjson parses them directly; get_messages()
+        has already checked that the session_id bytes occur in the line.
         Supports prefix matching: session_id 'ab841016' matches 'ab841016-f07b-...'.
         """
         try:
-            # Fast pre-filter: session_id must appear in the raw line (no false negatives).
-            if session_id not in line:
-                return None
-            data = _json_loads(line)
+            data = _loads_line_bytes(line)
             msg_session = data.get("sessionId", "")
             # Prefix match: allow short IDs (e.g. 'ab841016') to match full UUIDs
             if msg_session != session_id and not msg_session.startswith(session_id):
@@ -1194,23 +1553,26 @@ class SessionRecoveryEngine:
         if not self.projects_dir.exists():
             return messages
 
-        for project_dir in self.projects_dir.glob("*"):
-            if not project_dir.is_dir():
+        # Fast pre-filter on raw bytes: lines that do not mention the session are
+        # skipped without UTF-8 decoding or JSON parsing (no false negatives).
+        session_key = session_id.encode("utf-8")
+        for _project_dir_name, jsonl_file in self._iter_session_jsonl_files(session_id):
+            try:
+                with open(jsonl_file, "rb", buffering=_JSONL_READ_BUFFER) as f:
+                    if _looks_binary(f):
+                        continue
+                    for line in f:
+                        if session_key not in line:
+                            continue
+                        msg = self._process_message_line(line, session_id, message_type)
+                        if msg:
+                            messages.append(msg)
+            except OSError:
                 continue
 
-            for jsonl_file in project_dir.glob(f"{session_id}*.jsonl"):
-                try:
-                    with open(jsonl_file, encoding="utf-8", errors="replace") as f:
-                        for line in f:
-                            msg = self._process_message_line(line, session_id, message_type)
-                            if msg:
-                                messages.append(msg)
-                except OSError:
-                    continue
-
         return messages
 
-    def search_messages(  # noqa: C901
+    def search_messages(
         self,
         query: str,
         message_type: Optional[str] = None,
@@ -1252,6 +1614,40 @@ class SessionRecoveryEngine:
         Raises:
             ValueError: If query is not a valid glob or regex.
         """
+        return list(self._iter_search_messages(
+            query,
+            message_type=message_type,
+            tool=tool,
+            exclude_compaction=exclude_compaction,
+            since=since,
+            session_id=session_id,
+            fixed_strings=fixed_strings,
+            after_index=after_index,
+            after_timestamp=after_timestamp,
+            tool_use_only=tool_use_only,
+            include_tool_result=include_tool_result,
+        ))
+
+    def _iter_search_messages(
+        self,
+        query: str,
+        message_type: Optional[str] = None,
+        tool: Optional[str] = None,
+        exclude_compaction: bool = False,
+        since: Optional[str] = None,
+        session_id: Optional[str] = None,
+        fixed_strings: bool = False,
+        after_index: int = 0,
+        after_timestamp: Optional[str] = None,
+        tool_use_only: bool = False,
+        include_tool_result: bool = False,
+    ) -> Iterator[SessionMessage]:
+        """Yield search_messages() results lazily, one session file at a time.
+
+        Same arguments and order as search_messages(); callers that only need the
+        first match (``next(..., None)``) stop reading once it is found.  Raises
+        ValueError for an invalid pattern on the first ``next()``.
+        """
         # tool_use only appears in assistant messages
         if tool is not None and message_type is None:
             message_type = "assistant"
@@ -1262,12 +1658,55 @@ class SessionRecoveryEngine:
             is_literal = True
             query_lower = query.lower() if query else None
         else:
-            pattern = self._compile_pattern(query) if query else None
-
-        # Pre-compute literal pre-filter: only safe when query has no regex metacharacters.
-        if not fixed_strings:
-            is_literal = not query or re.escape(query) == query
+            # A query without regex/glob metacharacters is matched as a plain
+            # case-insensitive substring (str.__contains__), skipping compilation.
+            is_literal = not query or _REGEX_META.isdisjoint(query)
+            pattern = None if is_literal else self._compile_pattern(query)
             query_lower = query.lower() if (is_literal and query) else None
+        # Raw-line pre-filter: a literal query itself, or for regex/glob queries the
+        # literal(s) every match must contain (None → every line is parsed).
+        # Not in tool mode: the query is matched against json.dumps(input), whose
+        # \uXXXX escapes for non-ASCII text never appear in the raw UTF-8 line, so a
+        # raw-line check could drop true matches; tool_hint still narrows lines there.
+        if tool is not None:
+            raw_literals = None
+        else:
+            raw_query = _longest_raw_query_run(query_lower) if query_lower else None
+            raw_literals = (raw_query,) if raw_query else (_required_literals(pattern.pattern) if pattern else None)
+        scan_file = functools.partial(
+            self._scan_messages_file,
+            query_lower=query_lower, pattern=pattern, raw_literals=raw_literals,
+            message_type=message_type, tool=tool, exclude_compaction=exclude_compaction,
+            after_index=after_index, after_timestamp=after_timestamp,
+            tool_use_only=tool_use_only, include_tool_result=include_tool_result,
+        )
+        jsonl_files = [path for _, path, _ in self._iter_all_jsonl(session_id_prefix=session_id, since=since)]
+        for jsonl_file, found in zip(jsonl_files, _scan_files(jsonl_files, scan_file), strict=True):
+            # Second pass per file: pair tool_use with toolUseResult before yielding
+            if include_tool_result and tool is not None and found:
+                self._attach_tool_results(found, [(jsonl_file, 0, len(found))])
+            yield from found
+
+    def _scan_messages_file(  # noqa: C901
+        self,
+        jsonl_file: Path,
+        *,
+        query_lower: str | None,
+        pattern: re.Pattern | None,
+        raw_literals: tuple[str, ...] | None,
+        message_type: str | None,
+        tool: str | None,
+        exclude_compaction: bool,
+        after_index: int,
+        after_timestamp: str | None,
+        tool_use_only: bool,
+        include_tool_result: bool,
+    ) -> List[SessionMessage]:
+        """Return the search_messages() matches in one JSONL file, in file order.
+
+        Called per file by _iter_search_messages(), which prepares the query and the
+        raw-line literals.  Unreadable or binary files yield no matches.
+        """
         # Heuristic: message_type value must appear in the raw JSON line (no false negatives).
         # "slash" and "compaction" are derived values (content-based), not literal JSONL fields —
         # they both come from "user" records, so pre-filter on "user" for those two.
@@ -1275,131 +1714,119 @@ class SessionRecoveryEngine:
         _raw_type = _RAW_TYPE_MAP.get(message_type, message_type) if message_type else None
         msg_type_hint = f'"{_raw_type}"' if _raw_type else None
         tool_lower = tool.lower() if tool else None
+        # Tool pre-filter: tool name value must appear in raw line.
+        # Use f'"{tool}"' (value-only check) — robust against both
+        # json (space-separated) and orjson (no-space) serialization.
+        tool_hint = f'"{tool}"' if tool else None
 
-        messages: List[SessionMessage] = []
-
-        # When include_tool_result is True, track which JSONL files had matches
-        # and the UUIDs we need to look up results for.
-        _files_with_matches: list = []  # [(jsonl_file, start_idx_in_messages)]
-
-        for _project_dir_name, jsonl_file, _ in self._iter_all_jsonl(
-            session_id_prefix=session_id, since=since
-        ):
-            _file_start_idx = len(messages)
-            try:
-                with open(jsonl_file, encoding="utf-8", errors="replace") as f:
-                    _msg_idx = 0
-                    for line in f:
-                        _msg_idx += 1
-                        # Skip messages before after_index within each session
-                        if after_index > 0 and _msg_idx <= after_index:
+        found: List[SessionMessage] = []
+        try:
+            with open(jsonl_file, encoding="utf-8", errors="replace", buffering=_JSONL_READ_BUFFER) as f:
+                if _looks_binary(f.buffer):
+                    return found
+                _msg_idx = 0
+                for line in f:
+                    _msg_idx += 1
+                    # Skip messages before after_index within each session
+                    if after_index > 0 and _msg_idx <= after_index:
+                        continue
+                    # Skip messages before after_timestamp (fast raw-line check)
+                    if after_timestamp:
+                        _ts_m = _TS_EXTRACT_RE.search(line)
+                        if _ts_m and _ts_m.group(1) < after_timestamp:
                             continue
-                        # Skip messages before after_timestamp (fast raw-line check)
-                        if after_timestamp:
-                            _ts_m = _TS_EXTRACT_RE.search(line)
-                            if _ts_m and _ts_m.group(1) < after_timestamp:
+                    try:
+                        # Raw line pre-filters: skip json.loads when possible.
+                        if raw_literals:
+                            line_lower = line.lower()
+                            if not any(lit in line_lower for lit in raw_literals):
                                 continue
-                        try:
-                            # Raw line pre-filters: skip json.loads when possible.
-                            if query_lower and query_lower not in line.lower():
+                        if msg_type_hint and msg_type_hint not in line:
+                            continue
+                        if tool_hint and tool_hint not in line:
+                            continue
+                        data = _json_loads(line)
+                        msg_type = data.get("type", "").lower()
+                        content = self._extract_content(data)
+
+                        # Extended type filter: slash and compaction are content-based
+                        if message_type == "slash":
+                            if msg_type != "user" or "<command-name>" not in (content or ""):
                                 continue
-                            if msg_type_hint and msg_type_hint not in line:
+                            # Exclude compaction summaries that quote <command-name> from prior messages
+                            if _is_compaction(data, content):
                                 continue
-                            # Tool pre-filter: tool name value must appear in raw line.
-                            # Use f'"{tool}"' (value-only check) — robust against both
-                            # json (space-separated) and orjson (no-space) serialization.
-                            if tool and f'"{tool}"' not in line:
+                        elif message_type == "compaction":
+                            if not _is_compaction(data, content):
+                                continue
+                        elif message_type:
+                            if msg_type != message_type.lower():
                                 continue
-                            data = _json_loads(line)
-                            msg_type = data.get("type", "").lower()
-                            content = self._extract_content(data)
 
-                            # Extended type filter: slash and compaction are content-based
-                            if message_type == "slash":
-                                if msg_type != "user" or "<command-name>" not in (content or ""):
-                                    continue
-                                # Exclude compaction summaries that quote <command-name> from prior messages
-                                if _is_compaction(data, content):
-                                    continue
-                            elif message_type == "compaction":
-                                if not _is_compaction(data, content):
-                                    continue
-                            elif message_type:
-                                if msg_type != message_type.lower():
-                                    continue
+                        if exclude_compaction and _is_compaction(data, content):
+                            continue
 
-                            if exclude_compaction and _is_compaction(data, content):
+                        if tool is not None:
+                            # Tool filtering: scan content array DIRECTLY for tool_use blocks.
+                            # IMPORTANT: _extract_content() only returns type=="text" blocks
+                            # and would miss tool_use entries entirely — must NOT use it here.
+                            msg_content = data.get("message", {}).get("content", [])
+                            if not isinstance(msg_content, list):
                                 continue
-
-                            if tool is not None:
-                                # Tool filtering: scan content array DIRECTLY for tool_use blocks.
-                                # IMPORTANT: _extract_content() only returns type=="text" blocks
-                                # and would miss tool_use entries entirely — must NOT use it here.
+                            for item in _iter_tool_use_blocks(msg_content):
+                                if item.get("name", "").lower() == tool_lower:
+                                    # Serialize input for query matching + display
+                                    input_str = json.dumps(item.get("input", {}))
+                                    # Match query against tool input (literal or regex)
+                                    if query_lower:
+                                        matched = query_lower in input_str.lower()
+                                    elif pattern:
+                                        matched = bool(pattern.search(input_str))
+                                    else:
+                                        matched = True  # no query = match all
+                                    if matched:
+                                        # Store uuid for tool_result pairing
+                                        _msg_uuid = data.get("uuid", "") if include_tool_result else ""
+                                        found.append(SessionMessage(
+                                            type=self._parse_message_type(msg_type),
+                                            timestamp=data.get("timestamp", ""),
+                                            content=input_str,
+                                            session_id=data.get("sessionId", ""),
+                                            tool_result={"_uuid": _msg_uuid} if _msg_uuid else None,
+                                        ))
+                                        break  # one match per message line
+                        else:
+                            # tool_use_only: skip messages without tool_use blocks
+                            if tool_use_only:
                                 msg_content = data.get("message", {}).get("content", [])
                                 if not isinstance(msg_content, list):
                                     continue
-                                for item in _iter_tool_use_blocks(msg_content):
-                                    if item.get("name", "").lower() == tool_lower:
-                                        # Serialize input for query matching + display
-                                        input_str = json.dumps(item.get("input", {}))
-                                        # Match query against tool input (literal or regex)
-                                        if query_lower:
-                                            matched = query_lower in input_str.lower()
-                                        elif pattern:
-                                            matched = bool(pattern.search(input_str))
-                                        else:
-                                            matched = True  # no query = match all
-                                        if matched:
-                                            # Store uuid for tool_result pairing
-                                            _msg_uuid = data.get("uuid", "") if include_tool_result else ""
-                                            messages.append(SessionMessage(
-                                                type=self._parse_message_type(msg_type),
-                                                timestamp=data.get("timestamp", ""),
-                                                content=input_str,
-                                                session_id=data.get("sessionId", ""),
-                                                tool_result={"_uuid": _msg_uuid} if _msg_uuid else None,
-                                            ))
-                                            break  # one match per message line
-                            else:
-                                # tool_use_only: skip messages without tool_use blocks
-                                if tool_use_only:
-                                    msg_content = data.get("message", {}).get("content", [])
-                                    if not isinstance(msg_content, list):
-                                        continue
-                                    if not any(True for _ in _iter_tool_use_blocks(msg_content)):
-                                        continue
-                                # content already extracted above for type/compaction filtering
-                                if not content:
+                                if not any(True for _ in _iter_tool_use_blocks(msg_content)):
                                     continue
-                                # Match query against content (literal or regex)
-                                if query_lower:
-                                    if query_lower not in content.lower():
-                                        continue
-                                elif pattern:
-                                    if not pattern.search(content):
-                                        continue
-                                # else: no query = match all
-                                messages.append(
-                                        SessionMessage(
-                                            type=self._parse_message_type(msg_type),
-                                            timestamp=data.get("timestamp", ""),
-                                            content=content,
-                                            session_id=data.get("sessionId", ""),
-                                        )
+                            # content already extracted above for type/compaction filtering
+                            if not content:
+                                continue
+                            # Match query against content (literal or regex)
+                            if query_lower:
+                                if query_lower not in content.lower():
+                                    continue
+                            elif pattern:
+                                if not pattern.search(content):
+                                    continue
+                            # else: no query = match all
+                            found.append(
+                                    SessionMessage(
+                                        type=self._parse_message_type(msg_type),
+                                        timestamp=data.get("timestamp", ""),
+                                        content=content,
+                                        session_id=data.get("sessionId", ""),
                                     )
-                        except (json.JSONDecodeError, KeyError, ValueError):
-                            continue
-            except OSError:
-                continue
-            # Track files that produced new matches for the result-pairing pass
-            if include_tool_result and tool is not None and len(messages) > _file_start_idx:
-                _files_with_matches.append((jsonl_file, _file_start_idx, len(messages)))
-
-        # ── Second pass: pair tool_use with toolUseResult ────────────────
-        if include_tool_result and tool is not None and _files_with_matches:
-            self._attach_tool_results(messages, _files_with_matches)
-
-        return messages
+                                )
+                    except (json.JSONDecodeError, KeyError, ValueError):
+                        continue
+        except OSError:
+            pass
+        return found
 
     @staticmethod
     def _attach_tool_results(
@@ -1862,7 +2289,7 @@ class SessionRecoveryEngine:
                                     continue
                                 inp = item.get("input", {})
                                 fp = inp.get("file_path", "")
-                                if filename != "*" and Path(fp).name != filename:
+                                if filename != "*" and os.path.basename(fp) != filename:
                                     continue
                                 yield {
                                     "tool": tool_name,
@@ -2222,6 +2649,9 @@ class SessionRecoveryEngine:
         else:
             pattern = self._compile_pattern(query) if query else None
         tool_lower = tool.lower() if tool else None
+        # Lowercased once here rather than per buffered message in the match loop.
+        query_lower = query.lower() if (fixed_strings and query) else None
+        message_type_lower = message_type.lower() if message_type else None
 
         results: List[ContextMatch] = []
 
@@ -2293,14 +2723,14 @@ class SessionRecoveryEngine:
                     if not (msg.content or "").startswith("This session is being continued"):
                         continue
                 elif message_type:
-                    if msg_type_str != message_type.lower():
+                    if msg_type_str != message_type_lower:
                         continue
                 if exclude_compaction and (msg.content or "").startswith("This session is being continued"):
                     continue
                 # Match content against query: regex (default) or literal (-F)
                 content_text = msg.content or ""
                 if fixed_strings:
-                    matched = not query or query.lower() in content_text.lower()
+                    matched = not query_lower or query_lower in content_text.lower()
                 else:
                     matched = not pattern or pattern.search(content_text)
                 if matched:
@@ -2362,34 +2792,38 @@ class SessionRecoveryEngine:
 
         if self.recovery_dir.exists():
             # File count: recovery_dir/session_<session_id>/ (excludes all_versions dirs)
-            for session_dir in self.recovery_dir.glob("session_*"):
-                if not session_dir.is_dir() or "all_versions" in session_dir.name:
-                    continue
-                sid = session_dir.name.removeprefix("session_")
-                if filtered_ids is not None and sid not in filtered_ids:
-                    continue   # O(1) frozenset lookup
-                for file_path in session_dir.glob("*"):
-                    if file_path.is_file():
-                        total_files += 1
+            with os.scandir(self.recovery_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.startswith("session_") or "all_versions" in name or not entry.is_dir():
+                        continue
+                    sid = name.removeprefix("session_")
+                    if filtered_ids is not None and sid not in filtered_ids:
+                        continue   # O(1) frozenset lookup
+                    with os.scandir(entry.path) as files_it:
+                        total_files += sum(1 for f in files_it if f.is_file())
 
             # Version count: recovery_dir/session_all_versions_<session_id>/
+            # One pass per dir: each name is matched once, which both counts it and
+            # yields the original filename for the per-file totals.
             file_version_totals: Dict[str, int] = defaultdict(int)
             for session_dir in self._version_dirs:
                 # _version_dirs: dirs named "session_all_versions_<session_id>"
                 sid = session_dir.name.removeprefix("session_all_versions_")
                 if filtered_ids is not None and sid not in filtered_ids:
                     continue   # O(1) frozenset lookup
-                version_files = list(session_dir.glob("*_v*_line_*.txt"))
-                total_versions += len(version_files)
-                for v_file in version_files:
-                    filename = self._extract_filename(v_file.name)
-                    file_version_totals[filename] += 1
+                with os.scandir(session_dir) as versions_it:
+                    for v_entry in versions_it:
+                        match = _VERSION_NAME_RE.match(v_entry.name)
+                        if match:
+                            total_versions += 1
+                            file_version_totals[match.group(1)] += 1
 
             # Find globally largest file after accumulating all sessions
-            for filename, edits in file_version_totals.items():
-                if edits > largest_edits:
-                    largest_edits = edits
-                    largest_file = filename
+            # (max() keeps the first of equal counts, as the strict > scan did).
+            if file_version_totals:
+                largest_file = max(file_version_totals, key=file_version_totals.__getitem__)
+                largest_edits = file_version_totals[largest_file]
 
         return SessionStatistics(
             total_sessions=total_sessions,
@@ -2402,7 +2836,7 @@ class SessionRecoveryEngine:
     @staticmethod
     def _extract_filename(version_filename: str) -> str:
         """Extract original filename from versioned name (e.g. 'cli.py_v000001_line_10.txt' → 'cli.py')."""
-        match = re.match(r"(.+?)_v\d+_line_\d+\.txt$", version_filename)
+        match = _VERSION_NAME_RE.match(version_filename)
         return match.group(1) if match else version_filename
 
     @staticmethod
@@ -2445,44 +2879,56 @@ class SessionRecoveryEngine:
 
         Returns:
             Most recently recorded absolute path string, or None.
+
+        The result is memoized per filename for the life of the engine: restore and
+        reconstruct flows ask for the same name several times, and each uncached
+        lookup reads every session file.
         """
+        if filename in self._original_path_cache:
+            return self._original_path_cache[filename]
         if not self.projects_dir.exists():
             return None
 
         last_path: Optional[str] = None
+        # Lines are read as bytes: the pre-filter runs on raw bytes and only lines
+        # that mention the filename are handed to orjson, with no text decoding.
+        filename_key = filename.encode("utf-8")
 
-        for project_dir in self.projects_dir.iterdir():
-            if not project_dir.is_dir():
+        for _project_dir_name, jsonl_file in self._iter_session_jsonl_files(""):
+            try:
+                with open(jsonl_file, "rb", buffering=_JSONL_READ_BUFFER) as f:
+                    if _looks_binary(f):
+                        continue
+                    for line in f:
+                        # Fast pre-filters: filename must appear in the raw line, and so
+                        # must one of the two keys a recorded path can come from.
+                        if filename_key not in line:
+                            continue
+                        if b'"filePath"' not in line and b'"file_path"' not in line:
+                            continue
+                        try:
+                            data = _loads_line_bytes(line)
+                            # Path 1: toolUseResult.filePath (user confirmation message)
+                            tool_result = data.get("toolUseResult") or {}
+                            if isinstance(tool_result, dict):
+                                fp = tool_result.get("filePath", "")
+                                if fp and os.path.basename(fp) == filename:
+                                    last_path = fp
+                                    continue
+                            # Path 2: message.content[].input.file_path (assistant tool_use)
+                            msg = data.get("message") or {}
+                            if isinstance(msg, dict):
+                                for item in _iter_tool_use_blocks(msg.get("content") or []):
+                                    if item.get("name") in ("Write", "Edit", "NotebookEdit"):
+                                        fp = (item.get("input") or {}).get("file_path", "")
+                                        if fp and os.path.basename(fp) == filename:
+                                            last_path = fp
+                        except (json.JSONDecodeError, KeyError, ValueError):
+                            continue
+            except OSError:
                 continue
-            for jsonl_file in project_dir.glob("*.jsonl"):
-                try:
-                    with open(jsonl_file, encoding="utf-8", errors="replace") as f:
-                        for line in f:
-                            # Fast pre-filter: filename must appear in the raw line.
-                            if filename not in line:
-                                continue
-                            try:
-                                data = _json_loads(line)
-                                # Path 1: toolUseResult.filePath (user confirmation message)
-                                tool_result = data.get("toolUseResult") or {}
-                                if isinstance(tool_result, dict):
-                                    fp = tool_result.get("filePath", "")
-                                    if fp and Path(fp).name == filename:
-                                        last_path = fp
-                                        continue
-                                # Path 2: message.content[].input.file_path (assistant tool_use)
-                                msg = data.get("message") or {}
-                                if isinstance(msg, dict):
-                                    for item in _iter_tool_use_blocks(msg.get("content") or []):
-                                        if item.get("name") in ("Write", "Edit", "NotebookEdit"):
-                                            fp = (item.get("input") or {}).get("file_path", "")
-                                            if fp and Path(fp).name == filename:
-                                                last_path = fp
-                            except (json.JSONDecodeError, KeyError, ValueError):
-                                continue
-                except OSError:
-                    continue
 
+        self._original_path_cache[filename] = last_path
         return last_path
 
 
@@ -3602,9 +4048,13 @@ class AISession:
         )
         lines_md = []
         for msg in messages:
-            msg_type = msg.type.value if hasattr(msg.type, "value") else str(msg.type)
-            if msg_type == "system":
-                continue
+            match msg.type:
+                case MessageType.SYSTEM:
+                    continue
+                case MessageType():
+                    msg_type = msg.type.value
+                case _:
+                    msg_type = str(msg.type)
             ts_short = msg.timestamp[:16].replace("T", " ") if msg.timestamp else "\u2014"
             lines_md.append(f"## [{msg_type}] {ts_short}\n\n{msg.content}\n\n---\n")
         return header + "\n".join(lines_md)
@@ -3663,8 +4113,14 @@ class AISession:
         )
         project_dir = getattr(session_info, "project_dir", "") if session_info else ""
         sid = session_info.session_id if session_info else session_id
-        user_count = sum(1 for m in messages if m.type == MessageType.USER)
-        assistant_count = sum(1 for m in messages if m.type == MessageType.ASSISTANT)
+        # Single pass: match dispatches on the enum member instead of two == sweeps.
+        user_count = assistant_count = 0
+        for m in messages:
+            match m.type:
+                case MessageType.USER:
+                    user_count += 1
+                case MessageType.ASSISTANT:
+                    assistant_count += 1
         ts_first = messages[0].timestamp if messages else ""
         ts_last = messages[-1].timestamp if messages else ""
         return SessionAnalysis(
@@ -3700,9 +4156,13 @@ class AISession:
         events = []
         for msg in messages:
             content = msg.content or ""
-            msg_type = msg.type.value if hasattr(msg.type, "value") else str(msg.type)
-            if msg_type == "system":
-                continue  # skip system messages; consistent with Claude's timeline_session()
+            match msg.type:
+                case MessageType.SYSTEM:
+                    continue  # skip system messages; consistent with Claude's timeline_session()
+                case MessageType():
+                    msg_type = msg.type.value
+                case _:
+                    msg_type = str(msg.type)
             events.append({
                 "type": msg_type,
                 "timestamp": msg.timestamp,
@@ -3714,6 +4174,12 @@ class AISession:
     def get_original_path(self, filename: str) -> str | None:
         return self._claude_only("get_original_path", None, filename)
 
+    def clear_cache(self) -> None:
+        """Drop the Claude backend's memoized scans so new session activity is seen."""
+        claude_be = self._claude_backend
+        if claude_be:
+            claude_be.clear_cache()
+
     @property
     def recovery_dir(self) -> Path:
         """Recovery directory (Claude-only). Used by _version_src_path in cli.py."""
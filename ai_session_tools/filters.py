@@ -8,6 +8,7 @@ Licensed under the Apache License, Version 2.0
 from __future__ import annotations
 
 import fnmatch as _fnmatch
+import re as _re
 from collections.abc import Callable as _Callable, Iterable as _Iterable
 from typing import Generic, List, Optional, TypeVar
 
@@ -16,6 +17,13 @@ from .models import MessageType, SessionFile, SessionMessage
 T = TypeVar("T")
 
 
+def _compile_globs(patterns: "List[str] | None") -> "Optional[_Callable[[str], Optional[_re.Match]]]":
+    """Compile fnmatch patterns (lowercased) into one regex ``match`` callable, or None if empty."""
+    if not patterns:
+        return None
+    return _re.compile("|".join(_fnmatch.translate(p.lower()) for p in patterns)).match
+
+
 class Filter(Generic[T]):
     """Generic composable filter — base class for SearchFilter and MessageFilter.
 
@@ -186,9 +194,10 @@ class SearchFilter(Filter[SessionFile]):
 
         For glob-pattern matching with include/exclude, use by_location_pattern().
         """
+        location_lower = location.lower()
 
         def predicate(f: SessionFile) -> bool:
-            return location.lower() in f.location.lower()
+            return location_lower in f._location_lower
 
         self._predicates.append(predicate)
         return self
@@ -224,14 +233,16 @@ class SearchFilter(Filter[SessionFile]):
             busy_files = SearchFilter().by_edits(min_edits=5)
             combined   = src_files | busy_files
         """
-        _include = [p.lower() for p in (include or [])]
-        _exclude = [p.lower() for p in (exclude or [])]
+        # Translate each glob list once into a single alternation regex so the
+        # predicate does one C-level match per file instead of an fnmatch call per pattern.
+        _include = _compile_globs(include)
+        _exclude = _compile_globs(exclude)
 
         def predicate(f: SessionFile) -> bool:
-            loc = f.location.lower()
-            if _include and not any(_fnmatch.fnmatch(loc, p) for p in _include):
+            loc = f._location_lower
+            if _include is not None and _include(loc) is None:
                 return False
-            if _exclude and any(_fnmatch.fnmatch(loc, p) for p in _exclude):
+            if _exclude is not None and _exclude(loc) is not None:
                 return False
             return True
 
@@ -156,19 +156,14 @@ class CsvFormatter(ResultFormatter):
 
     def format(self, data: Any) -> str:
         """Format single item as CSV with header."""
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-        writer.writerow(_CSV_HEADER)
-        writer.writerow(_file_to_csv_row(data))
-        return buf.getvalue()
+        return self.format_many((data,))
 
     def format_many(self, items: Iterable[Any]) -> str:
         """Format multiple items as CSV with header. Accepts any iterable."""
         buf = io.StringIO()
         writer = csv.writer(buf)
         writer.writerow(_CSV_HEADER)
-        for item in items:
-            writer.writerow(_file_to_csv_row(item))
+        writer.writerows(map(_file_to_csv_row, items))
         return buf.getvalue()
 
 
@@ -10,7 +10,10 @@ Licensed under the Apache License, Version 2.0
 from __future__ import annotations
 
 import re as _re
+import sys as _sys
 from dataclasses import dataclass, field
+from datetime import datetime as _datetime
+from datetime import timezone as _timezone
 from enum import Enum
 from typing import Dict, Iterable, List, Optional, Set
 
@@ -83,6 +86,20 @@ def _resolve_date(date_str: str, mode: str = "start") -> str:
         return date_str
 
 
+def _parse_iso_naive(value: str) -> Optional[_datetime]:
+    """Parse an ISO 8601 date/datetime prefix into a naive datetime.
+
+    Truncates to 19 chars first, dropping timezone designators (Z, +00:00) and
+    fractional seconds so every source compares on the same wall-clock basis.
+    Date-only strings parse to midnight.  Returns None when unparseable
+    (e.g. "2026-02"), letting callers fall back to lexicographic comparison.
+    """
+    try:
+        return _datetime.fromisoformat(value[:19])
+    except ValueError:
+        return None
+
+
 class MessageType(str, Enum):
     """Session message types."""
 
@@ -141,6 +158,15 @@ class SessionFile:
     edit_count: int = 0
     notebook_edit_count: int = 0
 
+    def __post_init__(self) -> None:
+        # Lowercased once for case-insensitive location filters; ``location`` keeps
+        # its original casing for display.  Plain attribute, not a dataclass field,
+        # so it stays out of repr/eq/asdict.
+        self._location_lower = self.location.lower()
+        # Naive UTC datetime behind last_modified, set by the engine when it stats the
+        # file so date filters compare datetimes without reparsing the ISO string.
+        self._last_modified_dt: Optional[_datetime] = None
+
     @property
     def is_versioned(self) -> bool:
         """Check if file has version history."""
@@ -177,6 +203,21 @@ class SessionMessage:
     line_count: Optional[int] = None
     tool_result: Optional[dict] = None  # Tool output: {stdout_chars, stderr_chars, output_chars, output_words} when available
 
+    def __post_init__(self) -> None:
+        # Accept raw JSONL content blocks ([{"type": "text", "text": ...}, ...]) and
+        # flatten them once, joined like engine._extract_content(), so preview(),
+        # is_long and the formatters always see a str and never re-flatten.
+        if isinstance(self.content, list):
+            self.content = " ".join(
+                item.get("text", "")
+                for item in self.content
+                if isinstance(item, dict) and item.get("type") == "text"
+            )
+        # Result lists repeat a few session IDs on every message; interning keeps
+        # one str per session instead of one fresh copy per decoded record.
+        if type(self.session_id) is str:
+            self.session_id = _sys.intern(self.session_id)
+
     def preview(self, limit: int = 100) -> str:
         """Get preview of message content.
 
@@ -240,6 +281,29 @@ class SessionMetadata:
         return self.tool_name in ("Write", "Edit", "Read")
 
 
+@dataclass(frozen=True)
+class FrozenFilterSpec:
+    """Immutable, hashable snapshot of a FilterSpec (see ``FilterSpec.freeze()``).
+
+    Set fields become frozensets and ``file_patterns`` a tuple, so two specs with
+    the same settings compare and hash equal — usable as a cache key.
+    """
+
+    file_patterns: tuple = ("*",)
+    include_extensions: frozenset = frozenset()
+    exclude_extensions: frozenset = frozenset()
+    min_edits: int = 0
+    max_edits: Optional[int] = None
+    include_sessions: frozenset = frozenset()
+    exclude_sessions: frozenset = frozenset()
+    include_folders: frozenset = frozenset()
+    exclude_folders: frozenset = frozenset()
+    since: Optional[str] = None
+    until: Optional[str] = None
+    min_size: int = 0
+    max_size: Optional[int] = None
+
+
 @dataclass
 class FilterSpec:
     """Advanced filter specification (mutable builder pattern).
@@ -287,6 +351,8 @@ class FilterSpec:
 
     def matches_location(self, location: str) -> bool:
         """Check if location matches filter."""
+        if not self.include_folders and not self.exclude_folders:
+            return True
         location_lower = location.lower()
 
         if self.include_folders:
@@ -308,6 +374,10 @@ class FilterSpec:
         Returns:
             True if extension passes include/exclude filters.
         """
+        # Fast path: no extension filter, skip normalization entirely.
+        if not self.include_extensions and not self.exclude_extensions:
+            return True
+
         # Normalize extension (remove leading dot if present)
         normalized_ext = extension.lstrip(".")
 
@@ -373,17 +443,93 @@ class FilterSpec:
         # Use explicit equality checks rather than truthiness to avoid "0" being falsy
         if datetime_str is None or datetime_str == "":
             return self.since is None and self.until is None
-        if self.since or self.until:
-            # Truncate to 19 chars to strip timezone designators (+00:00, Z) and
-            # sub-second precision so that all sources compare correctly against
-            # the naive ISO strings produced by _parse_date_input.
-            datetime_str = datetime_str[:19]
-        if self.since and datetime_str < self.since:
+        if not self.since and not self.until:
+            return True
+        # Truncate to 19 chars to strip timezone designators (+00:00, Z) and
+        # sub-second precision so that all sources compare correctly against
+        # the naive ISO strings produced by _parse_date_input.
+        datetime_str = datetime_str[:19]
+        return self._in_bounds(_parse_iso_naive(datetime_str), datetime_str)
+
+    def _in_bounds(self, value_dt: Optional[_datetime], value_str: Optional[str]) -> bool:
+        """Compare a value against since/until for the matches_datetime*() methods.
+
+        Each bound is compared as a parsed datetime when both it and ``value_dt``
+        parse, and otherwise as an ISO string against ``value_str``.
+        """
+        since_dt, until_dt = self._parsed_bounds()
+        if self.since:
+            if value_dt is not None and since_dt is not None:
+                if value_dt < since_dt:
+                    return False
+            elif value_str is not None and value_str < self.since:
+                return False
+        if self.until:
+            if value_dt is not None and until_dt is not None:
+                if value_dt > until_dt:
+                    return False
+            elif value_str is not None and value_str > self.until:
+                return False
+        return True
+
+    def matches_datetime_obj(self, dt: Optional[_datetime]) -> bool:
+        """Check if a naive datetime is within the since/until range.
+
+        Same semantics as matches_datetime() for callers that already hold a
+        datetime (e.g. from stat().st_mtime), skipping string formatting and parsing.
+        """
+        if dt is None:
+            return self.since is None and self.until is None
+        if not self.since and not self.until:
+            return True
+        since_dt, until_dt = self._parsed_bounds()
+        if (self.since and since_dt is None) or (self.until and until_dt is None):
+            return self.matches_datetime(dt.isoformat(timespec="seconds"))
+        return self._in_bounds(dt, None)
+
+    def matches_timestamp(self, epoch: float) -> bool:
+        """Check if a POSIX timestamp (e.g. ``stat().st_mtime``) is within since/until.
+
+        Bounds are naive UTC, converted to epoch seconds once per spec, so the check
+        is a plain number comparison with no datetime built per file.  The timestamp
+        is floored to whole seconds, matching the truncated ISO strings.
+        """
+        if not self.since and not self.until:
+            return True
+        since_dt, until_dt = self._parsed_bounds()
+        seconds = epoch // 1
+        if (self.since and since_dt is None) or (self.until and until_dt is None):
+            return self.matches_datetime_obj(_datetime.fromtimestamp(seconds, _timezone.utc).replace(tzinfo=None))
+        since_epoch, until_epoch = self._bounds_cache[4], self._bounds_cache[5]
+        if since_epoch is not None and seconds < since_epoch:
             return False
-        if self.until and datetime_str > self.until:
+        if until_epoch is not None and seconds > until_epoch:
             return False
         return True
 
+    def _parsed_bounds(self) -> tuple:
+        """Return (since, until) as parsed datetimes, parsing each bound once.
+
+        Cached on the instance and keyed by the raw strings, so builder calls that
+        change since/until are picked up.  An unparseable bound yields None and
+        matches_datetime() compares that side lexicographically instead.
+        """
+        cached = self.__dict__.get("_bounds_cache")
+        if cached is None or cached[0] != self.since or cached[1] != self.until:
+            since_dt = _parse_iso_naive(self.since) if self.since else None
+            until_dt = _parse_iso_naive(self.until) if self.until else None
+            cached = (
+                self.since,
+                self.until,
+                since_dt,
+                until_dt,
+                # Epoch seconds of the same bounds, for matches_timestamp().
+                since_dt.replace(tzinfo=_timezone.utc).timestamp() if since_dt else None,
+                until_dt.replace(tzinfo=_timezone.utc).timestamp() if until_dt else None,
+            )
+            self._bounds_cache = cached
+        return cached[2], cached[3]
+
     def with_pattern(self, *patterns: str) -> FilterSpec:
         """Builder: set file patterns."""
         self.file_patterns = list(patterns)
@@ -411,6 +557,9 @@ class FilterSpec:
             exclude: Extensions to exclude (e.g. {"pyc", "tmp"}). Applied after include.
                      Pass empty set to clear. None means "leave current setting unchanged".
 
+        The sets are stored as given, without copying or normalizing, so entries
+        should be bare extensions without a leading dot.
+
         Returns:
             Self for builder chaining.
 
@@ -550,6 +699,31 @@ class FilterSpec:
         self.max_edits = max_edits
         return self
 
+    def freeze(self) -> FrozenFilterSpec:
+        """Return a hashable snapshot of the current settings.
+
+        The builder stays mutable; later with_*() calls do not affect the snapshot.
+
+        Example::
+
+            key = (pattern, spec.freeze())   # e.g. an lru_cache / dict key
+        """
+        return FrozenFilterSpec(
+            file_patterns=tuple(self.file_patterns),
+            include_extensions=frozenset(self.include_extensions),
+            exclude_extensions=frozenset(self.exclude_extensions),
+            min_edits=self.min_edits,
+            max_edits=self.max_edits,
+            include_sessions=frozenset(self.include_sessions),
+            exclude_sessions=frozenset(self.exclude_sessions),
+            include_folders=frozenset(self.include_folders),
+            exclude_folders=frozenset(self.exclude_folders),
+            since=self.since,
+            until=self.until,
+            min_size=self.min_size,
+            max_size=self.max_size,
+        )
+
     def __call__(self, files: Iterable) -> list:
         """Apply this FilterSpec as a post-glob predicate filter.
 
@@ -570,29 +744,36 @@ class FilterSpec:
             spec = FilterSpec().with_since("7d").with_extensions(include={"py"})
             filtered = spec(all_files)   # directly callable like SearchFilter
         """
+        # Decide once which checks are active so the per-file loop skips the
+        # method calls for filters that cannot reject anything.
+        check_ext = bool(self.include_extensions or self.exclude_extensions)
+        check_edits = bool(self.min_edits or self.max_edits is not None)
+        check_size = bool(self.min_size or self.max_size is not None)
+        check_location = bool(self.include_folders or self.exclude_folders)
+        check_datetime = bool(self.since or self.until)
+        include_sessions = self.include_sessions
+        exclude_sessions = self.exclude_sessions
         result = []
         for f in files:
-            if not self.matches_extension(f.file_type):
+            if check_ext and not self.matches_extension(f.file_type):
                 continue
-            if not self.matches_edits(f.edits):
+            if check_edits and not self.matches_edits(f.edits):
                 continue
-            if not self.matches_size(f.size_bytes):
+            if check_size and not self.matches_size(f.size_bytes):
                 continue
-            if not self.matches_location(f.location):
+            if check_location and not self.matches_location(f.location):
                 continue
-            if not self.matches_datetime(f.last_modified or ""):
+            if check_datetime and not self.matches_datetime(f.last_modified or ""):
                 continue
             # Session filter — mirrors _apply_all_filters() in engine.py:
             # • include_sessions: file must belong to at least one included session
             #   (files with no recorded sessions are excluded when include_sessions is set)
             # • exclude_sessions: files with no sessions are NOT excluded
             #   (they cannot belong to any excluded session, so they pass)
-            if self.include_sessions:
-                if not any(self.matches_session(s) for s in (f.sessions or [])):
-                    continue
-            if self.exclude_sessions:
-                if any(s in self.exclude_sessions for s in (f.sessions or [])):
-                    continue
+            if include_sessions and include_sessions.isdisjoint(f.sessions or ()):
+                continue
+            if exclude_sessions and not exclude_sessions.isdisjoint(f.sessions or ()):
+                continue
             result.append(f)
         return result
 
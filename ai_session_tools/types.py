@@ -36,9 +36,13 @@ class Extractable(Protocol):
         ...
 
 
-@runtime_checkable
 class Filterable(Protocol):
-    """Protocol for filtering operations."""
+    """Protocol for filtering operations.
+
+    Static typing only (not ``@runtime_checkable``): nothing branches on
+    ``isinstance(x, Filterable)``, and the runtime check would sweep every
+    member with ``hasattr`` on each call.
+    """
 
     def apply_filters(self, items: List[Any], filters: FilterSpec) -> List[Any]:
         """Apply filters to collection."""
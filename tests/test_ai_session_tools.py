@@ -12,9 +12,14 @@ Tests cover:
 - New: session listing, corrections, planning usage, tool search, cross-ref, export
 """
 
+import contextlib
+import io
 import json
 import os
 import re
+import threading
+import time
+from itertools import pairwise
 from pathlib import Path
 from typing import Optional
 
@@ -23,7 +28,9 @@ from typing import Optional
 # below strips all remaining ANSI sequences from output automatically.
 os.environ.setdefault("NO_COLOR", "1")
 
+import click
 import pytest
+from typer.main import get_command
 from typer.testing import CliRunner as _BaseCliRunner
 
 # Regex matching all ANSI escape sequences: CSI (e.g. \x1b[1;2;36m),
@@ -78,52 +85,119 @@ from ai_session_tools import (
     SessionRecoveryEngine,
 )
 from ai_session_tools.cli import app
+from ai_session_tools.engine import _PARALLEL_SCAN_MAX_WORKERS
+from ai_session_tools.formatters import MessageFormatter, PlainFormatter
 
 runner = CliRunner()
 
+# Real recovery data scanned by the integration tests (via the ``engine`` fixture).
+_RECOVERY_DIR = Path.home() / ".claude" / "recovery" / "2026_02_22_session_scripts_recovery"
 
-@pytest.fixture
+# Existence is checked once at import instead of on every engine-backed test.
+requires_recovery_dir = pytest.mark.skipif(not _RECOVERY_DIR.exists(), reason="Recovery directory not found")
+
+
+@pytest.fixture(scope="session")
 def recovery_dir():
     """Get the recovery directory path"""
-    return Path.home() / ".claude" / "recovery" / "2026_02_22_session_scripts_recovery"
+    return _RECOVERY_DIR
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def projects_dir():
     """Get the projects directory path"""
     return Path.home() / ".claude" / "projects"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def engine(recovery_dir, projects_dir):
-    """Create a SessionRecoveryEngine instance"""
-    if not recovery_dir.exists():
-        pytest.skip("Recovery directory not found")
+    """Create one SessionRecoveryEngine shared by all integration tests.
+
+    Session-scoped: tests only read from it, and the engine's internal caches
+    make later searches cheap.  Classes using it carry ``requires_recovery_dir``
+    so they are skipped up front when the recovery directory is missing.
+    """
     return SessionRecoveryEngine(projects_dir, recovery_dir)
 
 
+@pytest.fixture(scope="session")
+def all_searches(engine):
+    """engine.search_many() for the shared patterns: one recovery walk per run."""
+    return engine.search_many(["*", "*.py"])
+
+
+@pytest.fixture(scope="session")
+def all_files(all_searches):
+    """engine.search("*") computed once per run. Read-only: copy before mutating."""
+    return all_searches["*"]
+
+
+@pytest.fixture(scope="session")
+def py_files(all_searches):
+    """engine.search("*.py") computed once per run. Read-only: copy before mutating."""
+    return all_searches["*.py"]
+
+
+@pytest.fixture(scope="session")
+def dated_py_files(py_files):
+    """The py_files entries whose last_modified was populated, filtered once per run."""
+    return [r for r in py_files if r.last_modified is not None]
+
+
+@pytest.fixture(scope="session")
+def stats(engine):
+    """engine.get_statistics() computed once per run."""
+    return engine.get_statistics()
+
+
+class _MemoizedMessageEngine:
+    """Read-only proxy memoizing message scans by their exact arguments.
+
+    Keys keep the query's original case so that case-insensitivity tests still
+    compare two independent scans.  Results are shared: copy before mutating.
+    """
+
+    def __init__(self, engine: SessionRecoveryEngine) -> None:
+        self._engine = engine
+        self._search: dict = {}
+        self._get: dict = {}
+
+    def search_messages(self, query: str, message_type: Optional[str] = None):
+        key = (query, message_type)
+        if key not in self._search:
+            self._search[key] = self._engine.search_messages(query, message_type)
+        return self._search[key]
+
+    def get_messages(self, session_id: str, message_type: Optional[str] = None):
+        key = (session_id, message_type)
+        if key not in self._get:
+            self._get[key] = self._engine.get_messages(session_id, message_type)
+        return self._get[key]
+
+
+@pytest.fixture(scope="session")
+def cached_engine(engine):
+    """Session-wide memo of engine.search_messages / engine.get_messages."""
+    return _MemoizedMessageEngine(engine)
+
+
 class TestFileSearch:
     """Test file search functionality"""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
-    def test_search_returns_list(self, engine):
+    def test_search_returns_list(self, py_files):
         """Test that search returns a list"""
-        results = engine.search("*.py")
+        results = py_files
         assert isinstance(results, list)
 
-    def test_search_finds_python_files(self, engine):
+    def test_search_finds_python_files(self, py_files):
         """Test searching for Python files"""
-        results = engine.search("*.py")
-        assert len(results) > 0
-        filenames = [r.name for r in results]
-        assert any(f.endswith(".py") for f in filenames)
+        assert len(py_files) > 0
+        assert any(r.name.endswith(".py") for r in py_files)
 
-    def test_search_returns_sorted_by_edits(self, engine):
+    def test_search_returns_sorted_by_edits(self, py_files):
         """Test that results are sorted by edit count (descending)"""
-        results = engine.search("*.py")
-        if len(results) > 1:
-            edits = [r.edits for r in results]
-            assert edits == sorted(edits, reverse=True)
+        assert all(a.edits >= b.edits for a, b in pairwise(py_files))
 
     def test_search_with_filters(self, engine):
         """Test searching with FilterSpec"""
@@ -131,36 +205,39 @@ class TestFileSearch:
         results = engine.search("*.py", filters)
         assert all(r.edits >= 5 for r in results)
 
-    def test_search_empty_pattern(self, engine):
-        """Test search with empty/broad pattern"""
-        results = engine.search(".*")
-        assert isinstance(results, list)
+    def test_search_empty_pattern(self, engine, all_files):
+        """A match-all regex finds the same files as the shared "*" glob search.
+
+        ".+" rather than ".*": any pattern containing "*" or "?" is treated as a glob.
+        """
+        results = engine.search(".+")
+        assert {r.name for r in results} == {r.name for r in all_files}
 
 
 class TestVersionExtraction:
     """Test version extraction functionality"""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
-    def test_get_versions_returns_list(self, engine):
+    def test_get_versions_returns_list(self, engine, py_files):
         """Test that get_versions returns a list"""
-        results = engine.search("*.py")
+        results = py_files
         if results:
             filename = results[0].name
             versions = engine.get_versions(filename)
             assert isinstance(versions, list)
 
-    def test_get_versions_are_sorted(self, engine):
+    def test_get_versions_are_sorted(self, engine, py_files):
         """Test that versions are sorted"""
-        results = engine.search("*.py")
+        results = py_files
         if results:
             filename = results[0].name
             versions = engine.get_versions(filename)
-            if len(versions) > 1:
-                assert versions == sorted(versions)
+            # FileVersion defines only __lt__: "not b < a" is the ascending check
+            assert all(not b < a for a, b in pairwise(versions))
 
-    def test_get_versions_contains_file_versions(self, engine):
+    def test_get_versions_contains_file_versions(self, engine, py_files):
         """Test that versions contain FileVersion objects"""
-        results = engine.search("*.py")
+        results = py_files
         if results:
             filename = results[0].name
             versions = engine.get_versions(filename)
@@ -169,23 +246,20 @@ class TestVersionExtraction:
 
 class TestStatistics:
     """Test statistics collection"""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
-    def test_get_statistics_returns_object(self, engine):
+    def test_get_statistics_returns_object(self, stats):
         """Test that get_statistics returns proper object"""
-        stats = engine.get_statistics()
         assert stats is not None
 
-    def test_statistics_has_expected_attributes(self, engine):
+    def test_statistics_has_expected_attributes(self, stats):
         """Test that statistics have expected attributes"""
-        stats = engine.get_statistics()
         assert hasattr(stats, "total_sessions")
         assert hasattr(stats, "total_files")
         assert hasattr(stats, "total_versions")
 
-    def test_statistics_are_positive(self, engine):
+    def test_statistics_are_positive(self, stats):
         """Test that statistics are positive numbers"""
-        stats = engine.get_statistics()
         assert stats.total_sessions > 0
         assert stats.total_files > 0
         assert stats.total_versions > 0
@@ -193,21 +267,22 @@ class TestStatistics:
 
 class TestMessages:
     """Test message extraction"""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
-    def test_search_messages_returns_list(self, engine):
+    def test_search_messages_returns_list(self, cached_engine):
         """Test that search_messages returns a list"""
-        messages = engine.search_messages("test")
+        messages = cached_engine.search_messages("test")
         assert isinstance(messages, list)
 
-    def test_get_messages_returns_list(self, engine):
+    def test_get_messages_returns_list(self, cached_engine):
         """Test that get_messages returns a list"""
-        messages = engine.get_messages("any_session_id")
+        messages = cached_engine.get_messages("any_session_id")
         assert isinstance(messages, list)
 
 
 class TestFilters:
     """Test composable filter functionality"""
+    pytestmark = pytest.mark.unit
 
     def test_search_filter_creation(self):
         """Test creating a search filter"""
@@ -235,30 +310,27 @@ class TestFileLocation:
 
     def test_location_is_string(self):
         """SessionFile.location is a plain string, not an enum."""
-        from ai_session_tools import SessionFile
         r = SessionFile(name="a.py", path="/a.py", file_type="py")
         assert isinstance(r.location, str)
 
     def test_location_default_is_recovery(self):
         """SessionFile.location defaults to 'recovery'."""
-        from ai_session_tools import SessionFile
         r = SessionFile(name="a.py", path="/a.py", file_type="py")
         assert r.location == "recovery"
 
     def test_location_can_be_custom_string(self):
         """SessionFile.location accepts any string."""
-        from ai_session_tools import SessionFile
         r = SessionFile(name="a.py", path="/a.py", file_type="py", location="custom/path")
         assert r.location == "custom/path"
 
 
 class TestIntegration:
     """Integration tests combining multiple operations"""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
-    def test_search_and_get_versions(self, engine):
+    def test_search_and_get_versions(self, engine, py_files):
         """Test searching then getting versions"""
-        results = engine.search("*.py")
+        results = py_files
         if results:
             filename = results[0].name
             versions = engine.get_versions(filename)
@@ -540,8 +612,7 @@ class TestPlanningUsageSortedByCount:
         projects = _make_projects_with_sessions(tmp_path)
         engine = _make_engine(tmp_path, projects)
         results = engine.analyze_planning_usage()
-        counts = [r.count for r in results]
-        assert counts == sorted(counts, reverse=True)
+        assert all(a.count >= b.count for a, b in pairwise(results))
 
 
 class TestPlanningUsageCustomCommands:
@@ -580,6 +651,20 @@ class TestSearchMessagesToolWithQuery:
         assert len(results) >= 1
         assert all("login" in r.content for r in results)
 
+    def test_regex_matching_escaped_input_not_prefiltered(self, tmp_path):
+        """Tool input is matched as json.dumps() text, where é is \\u00e9; the raw
+        UTF-8 line has no such literal, so it must not be dropped before parsing."""
+        proj = tmp_path / "projects" / "-proj"
+        proj.mkdir(parents=True)
+        line = json.dumps({"sessionId": "s1", "type": "assistant", "timestamp": "2026-01-24T10:00:00Z",
+                           "message": {"role": "assistant", "content": [
+                               {"type": "tool_use", "id": "t1", "name": "Write",
+                                "input": {"file_path": "/p/caf\u00e9.py"}}]}}, ensure_ascii=False)
+        (proj / "s1.jsonl").write_text(line + "\n", encoding="utf-8")
+        engine = _make_engine(tmp_path, tmp_path / "projects")
+        [msg] = engine.search_messages("caf.u00e9", tool="Write")
+        assert "caf\\u00e9" in msg.content
+
 
 class TestSearchMessagesNoToolUnchanged:
     def test_no_tool_returns_user_messages(self, tmp_path):
@@ -1178,7 +1263,8 @@ class TestMessagesFindAlias:
         assert result.exit_code == 0
 
     @pytest.mark.integration
-    def test_statistics_consistency(self, engine):
+    @requires_recovery_dir
+    def test_statistics_consistency(self, all_files, stats):
         """Test that statistics are consistent.
 
         Note: search() now includes Edit-tracked files from JSONL (Phase 2),
@@ -1187,16 +1273,14 @@ class TestMessagesFindAlias:
 
         Marked integration: uses real engine fixture scanning all JSONL files.
         """
-        stats = engine.get_statistics()
-        search_results = engine.search(".*")
         # Both should return valid counts
         assert stats.total_files >= 0
-        assert len(search_results) >= stats.total_files  # search includes Edit files too
+        assert len(all_files) >= stats.total_files  # search includes Edit files too
 
 
 class TestEdgeCases:
     """Test edge cases and error handling"""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
     def test_search_nonexistent_pattern(self, engine):
         """Test searching for pattern that matches nothing"""
@@ -1208,14 +1292,14 @@ class TestEdgeCases:
         versions = engine.get_versions("NONEXISTENT_FILE.xyz")
         assert isinstance(versions, list)
 
-    def test_extract_with_invalid_path(self, engine):
+    def test_extract_with_invalid_path(self, engine, py_files, tmp_path):
         """Test extraction with invalid output path"""
-        results = engine.search("*.py")
+        results = py_files
         if results:
             filename = results[0].name
             # Just verify it doesn't crash
             try:
-                engine.extract_final(filename, Path("/tmp/ai_session_tools_test"))
+                engine.extract_final(filename, tmp_path / "ai_session_tools_test")
             except Exception:
                 # Expected to potentially fail with permission, but shouldn't crash
                 pass
@@ -1223,62 +1307,41 @@ class TestEdgeCases:
 
 class TestMultipleFileTypes:
     """Test searching for different file types (not just .py)"""
-    pytestmark = pytest.mark.integration
-
-    def test_search_markdown_files(self, engine):
-        """Test searching for Markdown files"""
-        results = engine.search("*.md")
-        # May be empty if no .md files exist, but shouldn't error
-        assert isinstance(results, list)
-
-    def test_search_json_files(self, engine):
-        """Test searching for JSON files"""
-        results = engine.search("*.json")
-        # May be empty if no .json files exist, but shouldn't error
-        assert isinstance(results, list)
-
-    def test_search_yaml_files(self, engine):
-        """Test searching for YAML files"""
-        results = engine.search("*.yaml")
-        assert isinstance(results, list)
-        # Verify all results are YAML files
-        if results:
-            assert all(r.name.endswith((".yaml", ".yml")) for r in results)
-
-    def test_search_typescript_files(self, engine):
-        """Test searching for TypeScript files"""
-        results = engine.search("*.ts")
-        assert isinstance(results, list)
-        if results:
-            assert all(r.name.endswith(".ts") for r in results)
-
-    def test_search_rust_files(self, engine):
-        """Test searching for Rust files"""
-        results = engine.search("*.rs")
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
+
+    @pytest.mark.parametrize("pattern, suffixes", [
+        ("*.md", (".md",)),
+        ("*.json", (".json",)),
+        ("*.yaml", (".yaml",)),
+        ("*.yml", (".yml",)),
+        ("*.ts", (".ts",)),
+        ("*.rs", (".rs",)),
+    ])
+    def test_search_by_extension(self, engine, pattern, suffixes):
+        """engine.search() with an extension glob returns only files with that suffix"""
+        results = engine.search(pattern)
+        # May be empty if no files of this type exist, but shouldn't error
         assert isinstance(results, list)
-        if results:
-            assert all(r.name.endswith(".rs") for r in results)
+        # Globs match case-insensitively, so compare lowercased names
+        assert all(r.name.lower().endswith(suffixes) for r in results)
 
-    def test_search_all_file_types_together(self, engine):
+    def test_search_all_file_types_together(self, all_files, py_files):
         """Test searching for all files regardless of type"""
-        results = engine.search("*")
-        assert isinstance(results, list)
-        # Should find more files with wildcard than specific patterns
-        py_results = engine.search("*.py")
-        if py_results:
-            assert len(results) >= len(py_results)
+        assert isinstance(all_files, list)
+        # The wildcard is a superset of any specific pattern; compare the
+        # already-built shared lists rather than searching again
+        assert len(all_files) >= len(py_files)
+        assert {r.name for r in py_files} <= {r.name for r in all_files}
 
-    def test_file_type_field_populated(self, engine):
+    def test_file_type_field_populated(self, all_files):
         """Test that file_type field is populated for all files"""
-        results = engine.search("*")
-        assert len(results) > 0, "Need at least one file to test"
-        for result in results:
-            assert result.file_type is not None
-            assert isinstance(result.file_type, str)
-            # file_type should be the extension without dot, or "unknown"
-            if "." in result.name:
-                expected_type = result.name.split(".")[-1]
-                assert result.file_type == expected_type or result.file_type == "unknown"
+        assert len(all_files) > 0, "Need at least one file to test"
+        assert all(isinstance(result.file_type, str) for result in all_files)
+        # file_type should be the extension without dot, or "unknown"
+        for result in all_files:
+            dot = result.name.rfind(".")
+            if dot != -1:
+                assert result.file_type in (result.name[dot + 1:], "unknown")
 
     def test_unknown_file_type_handling(self, engine):
         """Test that unknown file types are handled gracefully"""
@@ -1287,24 +1350,20 @@ class TestMultipleFileTypes:
         # Should not crash, even if no results
         assert isinstance(results, list)
 
-    def test_files_without_extension(self, engine):
+    def test_files_without_extension(self, all_files):
         """Test that files without extensions are handled"""
-        results = engine.search("*")
-        # Check if any files lack extensions
-        files_without_ext = [r for r in results if "." not in r.name]
-        for file in files_without_ext:
-            # Should have file_type of "unknown" or empty string
-            assert file.file_type in ("unknown", "")
+        # Files lacking an extension should have file_type "unknown" or empty string
+        assert all(r.file_type in ("unknown", "") for r in all_files if "." not in r.name)
 
 
 class TestFileTypeFiltering:
     """Test filtering by file type"""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
-    def test_filter_by_extension(self, engine):
+    def test_filter_by_extension(self, all_files):
         """Test SearchFilter with file extension filtering"""
         # Get all results first
-        all_results = engine.search("*")
+        all_results = all_files
         if len(all_results) > 0:
             # Try filtering by first file's extension
             first_extension = all_results[0].file_type
@@ -1313,17 +1372,17 @@ class TestFileTypeFiltering:
             # All results should match the extension
             assert all(f.file_type == first_extension for f in filtered)
 
-    def test_filter_by_python_extension(self, engine):
+    def test_filter_by_python_extension(self, all_files):
         """Test filtering specifically for Python files"""
-        all_results = engine.search("*")
+        all_results = all_files
         filter_obj = SearchFilter().by_extension("py")
         filtered = filter_obj(all_results)
         if filtered:
             assert all(r.file_type == "py" for r in filtered)
 
-    def test_filter_empty_result_for_nonexistent_extension(self, engine):
+    def test_filter_empty_result_for_nonexistent_extension(self, all_files):
         """Test filtering for an extension that doesn't exist"""
-        all_results = engine.search("*")
+        all_results = all_files
         filter_obj = SearchFilter().by_extension("nonexistent_extension_xyz")
         filtered = filter_obj(all_results)
         # Should return empty list since no files have that extension
@@ -1332,79 +1391,110 @@ class TestFileTypeFiltering:
 
 class TestMessageFiltering:
     """Test message extraction and filtering"""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
-    def test_get_messages_with_type_filter_user(self, engine):
+    def test_get_messages_with_type_filter_user(self, cached_engine, stats):
         """Test filtering for user messages only"""
-        stats = engine.get_statistics()
-        if stats.total_sessions > 0:
-            messages = engine.get_messages("*", message_type="user")
-            assert isinstance(messages, list)
-            # All returned messages must be user type
-            for msg in messages:
-                assert msg.type.value == "user"
-
-    def test_get_messages_with_type_filter_assistant(self, engine):
+        if stats.total_sessions == 0:
+            pytest.skip("No sessions to filter")
+        messages = cached_engine.get_messages("*", message_type="user")
+        assert isinstance(messages, list)
+        # All returned messages must be user type
+        assert all(msg.type.value == "user" for msg in messages)
+
+    def test_get_messages_with_type_filter_assistant(self, cached_engine, stats):
         """Test filtering for assistant messages only"""
-        stats = engine.get_statistics()
-        if stats.total_sessions > 0:
-            messages = engine.get_messages("*", message_type="assistant")
-            assert isinstance(messages, list)
-            for msg in messages:
-                assert msg.type.value == "assistant"
+        if stats.total_sessions == 0:
+            pytest.skip("No sessions to filter")
+        messages = cached_engine.get_messages("*", message_type="assistant")
+        assert isinstance(messages, list)
+        assert all(msg.type.value == "assistant" for msg in messages)
 
-    def test_search_messages_case_insensitive(self, engine):
+    def test_search_messages_case_insensitive(self, cached_engine):
         """Test that message search is case insensitive"""
-        results_lower = engine.search_messages("python")
-        results_upper = engine.search_messages("PYTHON")
+        results_lower = cached_engine.search_messages("python")
         assert isinstance(results_lower, list)
-        assert isinstance(results_upper, list)
-        # Both cases must return the same number of matches
-        assert len(results_lower) == len(results_upper)
+        # Two independent scans: a case-folded memo key would make this tautological
+        results_upper = cached_engine.search_messages("PYTHON")
+        # Both cases must return the same messages, not just the same count
+        assert [(m.session_id, m.timestamp) for m in results_lower] == [(m.session_id, m.timestamp) for m in results_upper]
 
-    def test_search_messages_with_phrases(self, engine):
+    def test_search_messages_with_phrases(self, cached_engine):
         """Test searching for multi-word phrases"""
-        results = engine.search_messages("session data")
+        results = cached_engine.search_messages("session data")
         assert isinstance(results, list)
 
 
 class TestFilterComposition:
     """Test composable filter combinations"""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
-    def test_filter_by_edits_range(self, engine):
-        """Test filtering by edit range"""
+    def test_engine_search_applies_filterspec(self, engine):
+        """FilterSpec is plumbed through engine.search (the one real filtered walk)"""
         filters = FilterSpec(min_edits=1, max_edits=50)
         results = engine.search("*", filters)
         assert all(1 <= r.edits <= 50 for r in results)
 
-    def test_filter_by_high_edit_count(self, engine):
+    def test_filter_by_edits_range(self, all_files):
+        """Test filtering by edit range"""
+        results = FilterSpec(min_edits=1, max_edits=50)(all_files)
+        assert all(1 <= r.edits <= 50 for r in results)
+
+    def test_filter_by_high_edit_count(self, all_files):
         """Test filtering for highly edited files"""
-        filters = FilterSpec(min_edits=100)
-        results = engine.search("*", filters)
+        results = FilterSpec(min_edits=100)(all_files)
         if results:
             assert all(r.edits >= 100 for r in results)
 
-    def test_filter_with_pattern_and_edits(self, engine):
+    def test_filter_with_pattern_and_edits(self, py_files):
         """Test combining pattern matching with edit filtering"""
-        filters = FilterSpec(min_edits=5)
-        py_results = engine.search("*.py", filters)
-        if py_results:
-            assert all(r.edits >= 5 for r in py_results)
-            assert all(r.name.endswith(".py") for r in py_results)
+        py_results = FilterSpec(min_edits=5)(py_files)
+        # One pass; the int compare runs before the string check
+        assert all(r.edits >= 5 and r.name.endswith(".py") for r in py_results)
 
-    def test_search_filter_multiple_conditions(self, engine):
+    def test_search_filter_multiple_conditions(self, all_files):
         """Test SearchFilter with multiple chained conditions"""
-        all_results = engine.search("*")
         filter_obj = SearchFilter().by_edits(min_edits=1).by_extension("py")
-        filtered = filter_obj(all_results)
-        if filtered:
-            assert all(r.edits >= 1 for r in filtered)
-            assert all(r.file_type == "py" for r in filtered)
+        filtered = filter_obj(all_files)
+        assert all(r.edits >= 1 and r.file_type == "py" for r in filtered)
 
 
 # ── Regression Tests: Already-completed steps ─────────────────────────────────
 
+# Named FilterSpec configurations for TestCompletedStepModels, built once per module.
+_MODEL_SPEC_FACTORIES = {
+    "default": FilterSpec,
+    "ext_py_md": lambda: FilterSpec().with_extensions(include={"py", "md"}),
+    "edits_5_10": lambda: FilterSpec(min_edits=5, max_edits=10),
+    "edits_unlimited": lambda: FilterSpec(min_edits=0, max_edits=None),
+    "sessions_abc_def": lambda: FilterSpec(include_sessions={"abc", "def"}),
+    "folder_recovery": lambda: FilterSpec(include_folders={"recovery"}),
+}
+
+# (spec name, FilterSpec method, args, expected result)
+_MODEL_SPEC_CASES = [
+    ("default", "matches_extension", ("py",), True),
+    ("default", "matches_extension", (".py",), True),
+    ("ext_py_md", "matches_extension", ("py",), True),    # with_extensions() builder
+    ("ext_py_md", "matches_extension", ("rs",), False),
+    ("edits_5_10", "matches_edits", (5,), True),
+    ("edits_5_10", "matches_edits", (10,), True),
+    ("edits_5_10", "matches_edits", (4,), False),
+    ("edits_5_10", "matches_edits", (11,), False),
+    ("edits_unlimited", "matches_edits", (999999,), True),  # max_edits=None is unlimited
+    ("sessions_abc_def", "matches_session", ("abc",), True),
+    ("sessions_abc_def", "matches_session", ("xyz",), False),
+    ("folder_recovery", "matches_location", ("recovery",), True),  # plain string locations
+    ("folder_recovery", "matches_location", ("other",), False),
+]
+
+
+@pytest.fixture(scope="module")
+def model_specs():
+    """One FilterSpec per named configuration in _MODEL_SPEC_FACTORIES."""
+    return {name: make() for name, make in _MODEL_SPEC_FACTORIES.items()}
+
+
 class TestCompletedStepModels:
     """Tests for already-completed models.py changes (Step 2)."""
 
@@ -1414,46 +1504,15 @@ class TestCompletedStepModels:
         assert hasattr(spec, "matches_datetime")
         assert callable(spec.matches_datetime)
 
-    def test_filter_spec_has_matches_extension(self):
-        """FilterSpec should have matches_extension method."""
-        spec = FilterSpec()
-        assert spec.matches_extension("py") is True
-        assert spec.matches_extension(".py") is True
-
-    def test_filter_spec_with_extensions_builder(self):
-        """FilterSpec.with_extensions() builder works."""
-        spec = FilterSpec().with_extensions(include={"py", "md"})
-        assert spec.matches_extension("py") is True
-        assert spec.matches_extension("rs") is False
-
-    def test_filter_spec_matches_edits(self):
-        """FilterSpec.matches_edits works with min/max."""
-        spec = FilterSpec(min_edits=5, max_edits=10)
-        assert spec.matches_edits(5) is True
-        assert spec.matches_edits(10) is True
-        assert spec.matches_edits(4) is False
-        assert spec.matches_edits(11) is False
-
-    def test_filter_spec_max_edits_none_is_unlimited(self):
-        """max_edits=None means unlimited."""
-        spec = FilterSpec(min_edits=0, max_edits=None)
-        assert spec.matches_edits(999999) is True
-
-    def test_filter_spec_matches_session(self):
-        """FilterSpec.matches_session works."""
-        spec = FilterSpec(include_sessions={"abc", "def"})
-        assert spec.matches_session("abc") is True
-        assert spec.matches_session("xyz") is False
-
-    def test_filter_spec_matches_location(self):
-        """FilterSpec.matches_location works with plain string location values."""
-        spec = FilterSpec(include_folders={"recovery"})
-        assert spec.matches_location("recovery") is True
-        assert spec.matches_location("other") is False
+    @pytest.mark.parametrize("spec_name, method, args, expected", _MODEL_SPEC_CASES)
+    def test_filter_spec_matches(self, model_specs, spec_name, method, args, expected):
+        """FilterSpec.matches_* methods honour each configuration."""
+        assert getattr(model_specs[spec_name], method)(*args) is expected
 
 
 class TestCompletedStepTypes:
     """Tests for already-completed types.py changes (Step 5)."""
+    pytestmark = pytest.mark.unit
 
     def test_searchable_protocol_has_search(self):
         """Searchable protocol should have search() method."""
@@ -1489,123 +1548,124 @@ class TestCompletedStepTypes:
         assert result == []
 
 
-class TestCompletedStepInitExports:
-    """Tests for already-completed __init__.py changes (Step 6)."""
+@pytest.fixture(scope="session")
+def pyproject_text():
+    """Repository pyproject.toml contents, read once per run."""
+    return (Path(__file__).parent.parent / "pyproject.toml").read_text()
 
-    def test_no_search_options_export(self):
-        """SearchOptions should NOT be exported (removed)."""
-        import ai_session_tools
-        assert not hasattr(ai_session_tools, "SearchOptions")
 
-    def test_no_file_extractor_export(self):
-        """FileExtractor should NOT be exported (extractors.py deleted)."""
-        import ai_session_tools
-        assert not hasattr(ai_session_tools, "FileExtractor")
+@pytest.fixture(scope="module")
+def pkg():
+    """The ai_session_tools package module, imported once for attribute checks."""
+    import ai_session_tools
+    return ai_session_tools
 
-    def test_no_message_extractor_export(self):
-        """MessageExtractor should NOT be exported (extractors.py deleted)."""
-        import ai_session_tools
-        assert not hasattr(ai_session_tools, "MessageExtractor")
 
-    def test_exports_session_statistics(self):
-        """SessionStatistics should be exported."""
-        assert SessionStatistics is not None
+@pytest.fixture(scope="module")
+def pkg_attrs(pkg):
+    """dir() of the package, taken once so export checks are set lookups.
 
-    def test_exports_session_file(self):
-        """SessionFile should be exported."""
-        assert SessionFile is not None
+    Only eagerly bound names appear; lazily resolved ones such as __version__
+    are checked through ``pkg`` directly.
+    """
+    return frozenset(dir(pkg))
+
+
+class TestCompletedStepInitExports:
+    """Tests for already-completed __init__.py changes (Step 6)."""
+
+    @pytest.mark.parametrize("attr, present", [
+        ("SearchOptions", False),      # removed
+        ("FileExtractor", False),      # extractors.py deleted
+        ("MessageExtractor", False),   # extractors.py deleted
+        ("SessionStatistics", True),
+        ("SessionFile", True),
+        ("MessageType", True),
+    ])
+    def test_export_presence(self, pkg_attrs, attr, present):
+        """Removed names stay gone; canonical model names are exported."""
+        assert (attr in pkg_attrs) is present
 
     def test_exports_message_type(self):
         """MessageType should be exported."""
         assert MessageType.USER.value == "user"
 
-    def test_composable_filter_not_in_public_api(self):
-        """ComposableFilter Protocol is removed from public API."""
-        import ai_session_tools
-        assert "ComposableFilter" not in getattr(ai_session_tools, "__all__", [])
-
-    def test_composable_search_not_in_public_api(self):
-        """ComposableSearch Protocol is removed from public API."""
-        import ai_session_tools
-        assert "ComposableSearch" not in getattr(ai_session_tools, "__all__", [])
+    @pytest.mark.parametrize("name", ["ComposableFilter", "ComposableSearch"])
+    def test_composable_protocol_not_in_public_api(self, pkg, name):
+        """ComposableFilter/ComposableSearch Protocols are removed from public API."""
+        assert name not in getattr(pkg, "__all__", [])
 
-    def test_version_not_hardcoded_2(self):
+    def test_version_not_hardcoded_2(self, pkg):
         """__version__ should not be '2.0.0' (was wrong, fixed to use importlib.metadata)."""
-        import ai_session_tools
-        assert ai_session_tools.__version__ != "2.0.0"
+        assert pkg.__version__ != "2.0.0"
+
+    def test_version_resolved_lazily_without_metadata_import(self):
+        """Importing the package does not import importlib.metadata; __version__ still resolves."""
+        import subprocess
+        import sys
+        code = (
+            "import sys, ai_session_tools.cli; "
+            "assert 'importlib.metadata' not in sys.modules; "
+            "import ai_session_tools; assert ai_session_tools.__version__"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
 
-    def test_author_is_andrew_hundt(self):
+    def test_author_is_andrew_hundt(self, pkg):
         """__author__ should be Andrew Hundt."""
-        import ai_session_tools
-        assert ai_session_tools.__author__ == "Andrew Hundt"
+        assert pkg.__author__ == "Andrew Hundt"
 
-    def test_pyproject_has_aise_alias(self):
+    def test_pyproject_has_aise_alias(self, pyproject_text):
         """pyproject.toml should have aise script alias."""
-        from pathlib import Path
-        pyproject = Path(__file__).parent.parent / "pyproject.toml"
-        content = pyproject.read_text()
-        assert 'aise = "ai_session_tools.cli:cli_main"' in content
+        assert 'aise = "ai_session_tools.cli:cli_main"' in pyproject_text
 
 
 # ── TDD Tests: Step 2b — MessageFormatter max_chars ──────────────────────────
 
-class TestSessionMessagePreview:
-    """TDD tests for SessionMessage.preview() method (was @property, now method with limit)."""
+# Shared message bodies for the preview/formatter tests below.
+_X200 = "x" * 200
+_X500 = "x" * 500
+_A300 = "a" * 300
+_B200 = "b" * 200
+_HELLO20 = "hello world " * 20
 
-    def test_preview_default_limit_100(self):
-        """preview() with default limit truncates at 100 chars."""
-        msg = SessionMessage(
-            type=MessageType.USER,
-            timestamp="2026-02-22T10:00:00Z",
-            content="x" * 200,
-            session_id="test-session",
-        )
-        result = msg.preview()
-        assert len(result) == 100
 
-    def test_preview_zero_returns_full_content(self):
-        """preview(0) returns full content (no truncation)."""
-        content = "x" * 500
-        msg = SessionMessage(
+@pytest.fixture
+def make_msg():
+    """Factory for USER SessionMessages that differ only in content."""
+    def _make(content: str) -> SessionMessage:
+        return SessionMessage(
             type=MessageType.USER,
             timestamp="2026-02-22T10:00:00Z",
             content=content,
             session_id="test-session",
         )
-        result = msg.preview(0)
-        assert len(result) == 500
+    return _make
 
-    def test_preview_custom_limit(self):
-        """preview(50) truncates at 50 chars."""
-        msg = SessionMessage(
-            type=MessageType.USER,
-            timestamp="2026-02-22T10:00:00Z",
-            content="x" * 200,
-            session_id="test-session",
-        )
-        result = msg.preview(50)
-        assert len(result) == 50
 
-    def test_preview_short_content_not_truncated(self):
+class TestSessionMessagePreview:
+    """TDD tests for SessionMessage.preview() method (was @property, now method with limit)."""
+
+    @pytest.mark.parametrize("content, limit, expected_len", [
+        (_X200, None, 100),  # default limit truncates at 100 chars
+        (_X500, 0, 500),     # preview(0) returns full content
+        (_X200, 50, 50),     # custom limit
+    ])
+    def test_preview_length(self, make_msg, content, limit, expected_len):
+        """preview() truncates to limit (default 100); 0 means no truncation."""
+        msg = make_msg(content)
+        result = msg.preview() if limit is None else msg.preview(limit)
+        assert len(result) == expected_len
+
+    def test_preview_short_content_not_truncated(self, make_msg):
         """preview() does not truncate content shorter than limit."""
-        msg = SessionMessage(
-            type=MessageType.USER,
-            timestamp="2026-02-22T10:00:00Z",
-            content="short",
-            session_id="test-session",
-        )
+        msg = make_msg("short")
         assert msg.preview() == "short"
         assert msg.preview(0) == "short"
         assert msg.preview(100) == "short"
 
-    def test_preview_replaces_newlines(self):
+    def test_preview_replaces_newlines(self, make_msg):
         """preview() replaces newlines with spaces."""
-        msg = SessionMessage(
-            type=MessageType.USER,
-            timestamp="2026-02-22T10:00:00Z",
-            content="line1\nline2\nline3",
-            session_id="test-session",
-        )
+        msg = make_msg("line1\nline2\nline3")
         assert "\n" not in msg.preview()
         assert "\n" not in msg.preview(0)
 
@@ -1613,78 +1673,41 @@ class TestSessionMessagePreview:
 class TestMessageFormatterMaxChars:
     """TDD tests for MessageFormatter accepting max_chars parameter."""
 
-    def test_formatter_default_shows_full_content(self):
+    def test_formatter_default_shows_full_content(self, make_msg):
         """MessageFormatter() with default max_chars=0 shows full content in format()."""
-        from ai_session_tools.formatters import MessageFormatter
         formatter = MessageFormatter()
-        msg = SessionMessage(
-            type=MessageType.USER,
-            timestamp="2026-02-22T10:00:00Z",
-            content="a" * 300,
-            session_id="test-session",
-        )
-        output = formatter.format(msg)
-        # Full content should appear (300 chars of 'a')
-        assert "a" * 300 in output.replace("\n", " ") or len([c for c in output if c == 'a']) >= 300
+        output = formatter.format(make_msg(_A300))
+        # Full content should appear (300 chars of 'a'); an unbroken run implies
+        # the count, so one count() covers both the plain and the wrapped case
+        assert output.count("a") >= 300
 
-    def test_formatter_max_chars_truncates(self):
+    def test_formatter_max_chars_truncates(self, make_msg):
         """MessageFormatter(max_chars=50) truncates in format()."""
-        from ai_session_tools.formatters import MessageFormatter
         formatter = MessageFormatter(max_chars=50)
-        msg = SessionMessage(
-            type=MessageType.USER,
-            timestamp="2026-02-22T10:00:00Z",
-            content="a" * 300,
-            session_id="test-session",
-        )
-        output = formatter.format(msg)
+        output = formatter.format(make_msg(_A300))
         # Should NOT contain 300 chars of 'a'
-        assert "a" * 300 not in output
+        assert _A300 not in output
 
-    def test_formatter_format_many_default_full_content(self):
+    def test_formatter_format_many_default_full_content(self, make_msg):
         """MessageFormatter().format_many() shows full content by default."""
-        from ai_session_tools.formatters import MessageFormatter
         formatter = MessageFormatter()
-        msgs = [
-            SessionMessage(
-                type=MessageType.USER,
-                timestamp="2026-02-22T10:00:00Z",
-                content="b" * 200,
-                session_id="test-session",
-            )
-        ]
-        output = formatter.format_many(msgs)
-        assert "b" * 200 in output
+        output = formatter.format_many([make_msg(_B200)])
+        assert _B200 in output
 
-    def test_formatter_format_many_max_chars_truncates(self):
+    def test_formatter_format_many_max_chars_truncates(self, make_msg):
         """MessageFormatter(max_chars=50).format_many() truncates."""
-        from ai_session_tools.formatters import MessageFormatter
         formatter = MessageFormatter(max_chars=50)
-        msgs = [
-            SessionMessage(
-                type=MessageType.USER,
-                timestamp="2026-02-22T10:00:00Z",
-                content="b" * 200,
-                session_id="test-session",
-            )
-        ]
-        output = formatter.format_many(msgs)
-        assert "b" * 200 not in output
+        output = formatter.format_many([make_msg(_B200)])
+        assert _B200 not in output
 
 
 class TestPlainFormatterPreview:
     """TDD tests for PlainFormatter using preview() method call."""
 
-    def test_plain_formatter_uses_preview_method(self):
+    def test_plain_formatter_uses_preview_method(self, make_msg):
         """PlainFormatter should use preview() as method, not property."""
-        from ai_session_tools.formatters import PlainFormatter
         formatter = PlainFormatter()
-        msg = SessionMessage(
-            type=MessageType.USER,
-            timestamp="2026-02-22T10:00:00Z",
-            content="hello world " * 20,
-            session_id="test-session",
-        )
+        msg = make_msg(_HELLO20)
         # Should not raise TypeError (would if preview is still @property and called as method)
         output = formatter.format(msg)
         assert isinstance(output, str)
@@ -1693,252 +1716,223 @@ class TestPlainFormatterPreview:
 
 # ── TDD Tests: Step 3 — Engine date/size filtering ───────────────────────────
 
-class TestFilterSpecMatchesDatetime:
-    """TDD tests for FilterSpec.matches_datetime() method."""
-
-    def test_no_filter_passes_any_datetime(self):
-        """With no datetime filters set, any datetime passes."""
-        spec = FilterSpec()
-        assert spec.matches_datetime("2026-02-22") is True
-        assert spec.matches_datetime("2026-02-22T14:30:00") is True
-        assert spec.matches_datetime("2020-01-01") is True
-
-    def test_no_filter_passes_none(self):
-        """With no datetime filters, None passes."""
-        spec = FilterSpec()
-        assert spec.matches_datetime(None) is True
+# (FilterSpec kwargs, datetime value, expected matches_datetime result)
+_MATCHES_DATETIME_CASES = [
+    # With no datetime filters set, any datetime (and None) passes.
+    ({}, "2026-02-22", True),
+    ({}, "2026-02-22T14:30:00", True),
+    ({}, "2020-01-01", True),
+    ({}, None, True),
+    # since excludes datetimes before the threshold.
+    ({"since": "2026-02-01"}, "2026-01-15", False),
+    ({"since": "2026-02-01"}, "2026-02-01", True),
+    ({"since": "2026-02-01"}, "2026-02-22T14:30:00", True),
+    # until excludes datetimes after the threshold.
+    ({"until": "2026-02-15"}, "2026-02-22", False),
+    ({"until": "2026-02-15"}, "2026-02-15", True),
+    ({"until": "2026-02-15"}, "2026-01-01T08:00:00", True),
+    # Combined since + until creates a range.
+    ({"since": "2026-02-01", "until": "2026-02-28"}, "2026-02-15", True),
+    ({"since": "2026-02-01", "until": "2026-02-28"}, "2026-02-15T12:00:00", True),
+    ({"since": "2026-02-01", "until": "2026-02-28"}, "2026-01-15", False),
+    ({"since": "2026-02-01", "until": "2026-02-28"}, "2026-03-01", False),
+    # None is excluded when any datetime filter is active (conservative).
+    ({"since": "2026-01-01"}, None, False),
+    ({"until": "2026-12-31"}, None, False),
+    # Full datetime filter against full datetime value.
+    ({"since": "2026-02-15T10:00:00", "until": "2026-02-15T18:00:00"}, "2026-02-15T12:00:00", True),
+    ({"since": "2026-02-15T10:00:00", "until": "2026-02-15T18:00:00"}, "2026-02-15T08:00:00", False),
+    ({"since": "2026-02-15T10:00:00", "until": "2026-02-15T18:00:00"}, "2026-02-15T20:00:00", False),
+    # Date-only filter works with full datetime values (mixed precision).
+    ({"since": "2026-02-15"}, "2026-02-15T14:30:00", True),
+    ({"since": "2026-02-15"}, "2026-02-14T23:59:59", False),
+    # Full datetime filter with date-only values: "2026-02-15" < "2026-02-15T14:30:00"
+    # lexicographically, so excluded.
+    ({"since": "2026-02-15T14:30:00"}, "2026-02-15", False),
+    ({"since": "2026-02-15T14:30:00"}, "2026-02-16", True),
+    # Space-separated datetimes compare by value, not by character (" " < "T").
+    ({"since": "2026-02-15T10:00:00"}, "2026-02-15 12:00:00", True),
+    ({"until": "2026-02-15T10:00:00"}, "2026-02-15 12:00:00", False),
+    # Unparseable bounds fall back to lexicographic comparison.
+    ({"since": "2026-02"}, "2026-02-15", True),
+    ({"since": "2026-02"}, "2026-01-31", False),
+]
+
+
+@pytest.fixture(scope="module")
+def spec_cache():
+    """One FilterSpec per distinct kwargs, shared by every case that uses it."""
+    return {}
 
-    def test_since_excludes_earlier(self):
-        """since excludes datetimes before the threshold."""
-        spec = FilterSpec(since="2026-02-01")
-        assert spec.matches_datetime("2026-01-15") is False
-        assert spec.matches_datetime("2026-02-01") is True
-        assert spec.matches_datetime("2026-02-22T14:30:00") is True
-
-    def test_until_excludes_later(self):
-        """until excludes datetimes after the threshold."""
-        spec = FilterSpec(until="2026-02-15")
-        assert spec.matches_datetime("2026-02-22") is False
-        assert spec.matches_datetime("2026-02-15") is True
-        assert spec.matches_datetime("2026-01-01T08:00:00") is True
-
-    def test_datetime_range(self):
-        """Combined since + until creates a range."""
-        spec = FilterSpec(since="2026-02-01", until="2026-02-28")
-        assert spec.matches_datetime("2026-02-15") is True
-        assert spec.matches_datetime("2026-02-15T12:00:00") is True
-        assert spec.matches_datetime("2026-01-15") is False
-        assert spec.matches_datetime("2026-03-01") is False
-
-    def test_none_excluded_when_filter_active(self):
-        """None is excluded when any datetime filter is active (conservative)."""
-        spec = FilterSpec(since="2026-01-01")
-        assert spec.matches_datetime(None) is False
 
-    def test_none_excluded_with_until(self):
-        """None is excluded when until is set."""
-        spec = FilterSpec(until="2026-12-31")
-        assert spec.matches_datetime(None) is False
+class TestFilterSpecMatchesDatetime:
+    """TDD tests for FilterSpec.matches_datetime() method."""
 
-    def test_full_datetime_filter_with_full_datetime_value(self):
-        """Full datetime filter against full datetime value."""
-        spec = FilterSpec(since="2026-02-15T10:00:00", until="2026-02-15T18:00:00")
-        assert spec.matches_datetime("2026-02-15T12:00:00") is True
-        assert spec.matches_datetime("2026-02-15T08:00:00") is False
-        assert spec.matches_datetime("2026-02-15T20:00:00") is False
+    @pytest.mark.parametrize("kwargs, value, expected", _MATCHES_DATETIME_CASES)
+    def test_matches_datetime(self, spec_cache, kwargs, value, expected):
+        key = tuple(sorted(kwargs.items()))
+        spec = spec_cache.get(key)
+        if spec is None:
+            spec = spec_cache[key] = FilterSpec(**kwargs)
+        assert spec.matches_datetime(value) is expected
+
+    def test_search_filter_by_date_agrees_in_batch(self):
+        """SearchFilter.by_date() applied once per spec keeps exactly the expected files."""
+        groups: dict = {}
+        for kwargs, value, expected in _MATCHES_DATETIME_CASES:
+            if kwargs and value is not None:
+                groups.setdefault(tuple(sorted(kwargs.items())), []).append((value, expected))
+        for key, cases in groups.items():
+            files = [SessionFile(name=f"f{i}.py", path=f"/f{i}.py", last_modified=value) for i, (value, _) in enumerate(cases)]
+            kept = SearchFilter().by_date(**dict(key))(files)
+            assert [f.last_modified for f in kept] == [value for value, expected in cases if expected], key
+
+    @pytest.mark.parametrize("kwargs, value, expected", _MATCHES_DATETIME_CASES)
+    def test_matches_datetime_obj_agrees(self, kwargs, value, expected):
+        """matches_datetime_obj() gives the same answer for the parsed value."""
+        import datetime
+        dt = datetime.datetime.fromisoformat(value) if value is not None else None
+        assert FilterSpec(**kwargs).matches_datetime_obj(dt) is expected
 
-    def test_date_filter_with_datetime_value(self):
-        """Date-only filter works with full datetime values (mixed precision)."""
-        spec = FilterSpec(since="2026-02-15")
-        assert spec.matches_datetime("2026-02-15T14:30:00") is True
-        assert spec.matches_datetime("2026-02-14T23:59:59") is False
+    @pytest.mark.parametrize("kwargs, value, expected", [c for c in _MATCHES_DATETIME_CASES if c[1] is not None])
+    def test_matches_timestamp_agrees(self, kwargs, value, expected):
+        """matches_timestamp() gives the same answer for the value as UTC epoch seconds."""
+        import datetime
+        epoch = datetime.datetime.fromisoformat(value).replace(tzinfo=datetime.timezone.utc).timestamp()
+        assert FilterSpec(**kwargs).matches_timestamp(epoch + 0.5) is expected
 
-    def test_datetime_filter_with_date_value(self):
-        """Full datetime filter works with date-only values (mixed precision)."""
-        spec = FilterSpec(since="2026-02-15T14:30:00")
-        # "2026-02-15" < "2026-02-15T14:30:00" lexicographically, so excluded
-        assert spec.matches_datetime("2026-02-15") is False
-        assert spec.matches_datetime("2026-02-16") is True
+    def test_engine_caches_last_modified_dt(self, tmp_path):
+        """Phase-1 files carry the stat datetime that last_modified is derived from."""
+        recovery = tmp_path / "recovery"
+        (recovery / "session_abc").mkdir(parents=True)
+        (recovery / "session_abc" / "foo.py").write_text("x = 1\n")
+        engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
+        [result] = engine.search("foo.py")
+        assert result._last_modified_dt is not None
+        assert result._last_modified_dt.isoformat() == result.last_modified
+        assert engine.search("foo.py", FilterSpec(since="2000-01-01")) == [result]
+        assert engine.search("foo.py", FilterSpec(since="2099-01-01")) == []
 
 
 class TestEnginePopulatesDateFields:
     """TDD tests for engine populating last_modified and created_date."""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
-    def test_search_results_have_last_modified(self, engine):
+    def test_search_results_have_last_modified(self, py_files, dated_py_files):
         """Search results should have last_modified populated (not None)."""
-        results = engine.search("*.py")
-        if results:
+        if py_files:
             # At least some files should have last_modified set
-            dated = [r for r in results if r.last_modified is not None]
-            assert len(dated) > 0, "Engine should populate last_modified from file stat"
+            assert len(dated_py_files) > 0, "Engine should populate last_modified from file stat"
 
-    def test_search_results_have_created_date(self, engine):
+    def test_search_results_have_created_date(self, py_files):
         """Search results should have created_date populated."""
-        results = engine.search("*.py")
+        results = py_files
         if results:
             dated = [r for r in results if r.created_date is not None]
             assert len(dated) > 0, "Engine should populate created_date from file stat"
 
-    def test_last_modified_is_iso_datetime_format(self, engine):
+    def test_last_modified_is_iso_datetime_format(self, dated_py_files):
         """last_modified should be ISO YYYY-MM-DDTHH:MM:SS format."""
-        results = engine.search("*.py")
-        if results:
-            for r in results:
-                if r.last_modified:
-                    assert len(r.last_modified) == 19, f"Expected YYYY-MM-DDTHH:MM:SS (19 chars), got {r.last_modified!r}"
-                    assert r.last_modified[4] == "-"
-                    assert r.last_modified[7] == "-"
-                    assert r.last_modified[10] == "T"
-                    assert r.last_modified[13] == ":"
-                    assert r.last_modified[16] == ":"
-
-    def test_datetime_filter_actually_filters(self, engine):
+        for r in dated_py_files:
+            if r.last_modified:
+                assert len(r.last_modified) == 19, f"Expected YYYY-MM-DDTHH:MM:SS (19 chars), got {r.last_modified!r}"
+                assert r.last_modified[4] == "-"
+                assert r.last_modified[7] == "-"
+                assert r.last_modified[10] == "T"
+                assert r.last_modified[13] == ":"
+                assert r.last_modified[16] == ":"
+
+    def test_datetime_filter_actually_filters(self, engine, py_files):
         """Datetime filter should actually exclude files outside the range."""
         # Get all files first
-        all_results = engine.search("*.py")
+        all_results = py_files
         if not all_results:
             pytest.skip("No files found")
 
         # Use a future datetime that should exclude everything
-        filters = FilterSpec(after="2099-01-01T00:00:00")
+        filters = FilterSpec(since="2099-01-01T00:00:00")
         filtered = engine.search("*.py", filters)
         assert len(filtered) < len(all_results), "Date filter should exclude some files"
 
 
 class TestEngineSizeFilterWired:
     """TDD tests for engine wiring matches_size() in _apply_all_filters."""
-    pytestmark = pytest.mark.integration
+    pytestmark = [pytest.mark.integration, requires_recovery_dir]
 
-    def test_size_filter_excludes_small_files(self, engine):
+    def test_size_filter_excludes_small_files(self, engine, all_files):
         """min_size filter should exclude files smaller than threshold."""
-        all_results = engine.search("*")
-        if not all_results:
+        if not all_files:
             pytest.skip("No files found")
 
         # Find max size to set a threshold that excludes some
-        max_size = max(r.size_bytes for r in all_results)
+        max_size = max(r.size_bytes for r in all_files)
         if max_size == 0:
             pytest.skip("All files have 0 size")
 
-        filters = FilterSpec(min_size=max_size)
-        filtered = engine.search("*", filters)
-        # Should have fewer results (only files >= max_size)
-        assert len(filtered) <= len(all_results)
+        # The engine's filtered walk is the one oracle; the expected set is
+        # derived in memory from the shared unfiltered results
+        filtered = engine.search("*", FilterSpec(min_size=max_size))
         assert all(r.size_bytes >= max_size for r in filtered)
+        assert {r.name for r in filtered} == {r.name for r in all_files if r.size_bytes >= max_size}
 
 
 # ── TDD Tests: Step 7 — CLI dual-ordering ────────────────────────────────────
 
-class TestCLIDualOrdering:
-    """TDD tests for CLI dual-ordering commands."""
+def _cli_help(*path: str) -> str:
+    """Render ``aise <path...> --help`` by walking the command tree directly.
 
-    def test_cli_has_search_command(self):
-        """CLI app has 'search' command."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["search", "--help"])
-        assert result.exit_code == 0
-        assert "search" in result.output.lower() or "pattern" in result.output.lower()
+    Skips argv parsing and the CliRunner I/O round-trip.  Typer's rich help
+    printer writes to stdout instead of returning, so that is captured too.
+    """
+    command = get_command(app)
+    ctx = click.Context(command, info_name="aise")
+    for name in path:
+        command = command.get_command(ctx, name)
+        assert command is not None, f"no command {' '.join(path)!r}"
+        ctx = click.Context(command, info_name=name, parent=ctx)
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        text = command.get_help(ctx)
+    return _strip_ansi(text + buf.getvalue())
+
+
+# (command path, substrings its --help must contain, case-insensitive)
+_CLI_HELP_CASES = [
+    (("files",), ()),
+    (("messages",), ()),
+    (("stats",), ()),
+    (("files", "search"), ("pattern", "--since", "--until", "--when", "include-sessions", "exclude-sessions", "include-extensions")),
+    (("messages", "search"), ("query", "max-chars")),
+    (("messages", "get"), ("session",)),
+    (("get",), ("session", "max-chars", "format")),
+]
 
-    def test_cli_has_files_group(self):
-        """CLI app has 'files' command group."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["files", "--help"])
-        assert result.exit_code == 0
 
-    def test_cli_has_messages_group(self):
-        """CLI app has 'messages' command group."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["messages", "--help"])
-        assert result.exit_code == 0
+class TestCLIDualOrdering:
+    """TDD tests for CLI dual-ordering commands."""
 
-    def test_cli_files_search_exists(self):
-        """'ais files search' route exists."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["files", "search", "--help"])
-        assert result.exit_code == 0
-        assert "pattern" in result.output.lower()
+    @pytest.mark.parametrize("path, needles", _CLI_HELP_CASES, ids=[" ".join(path) for path, _ in _CLI_HELP_CASES])
+    def test_cli_help_route(self, path, needles):
+        """Each route exists and its help lists the expected options.
 
-    def test_cli_messages_search_exists(self):
-        """'ais messages search' route exists."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["messages", "search", "--help"])
-        assert result.exit_code == 0
-        assert "query" in result.output.lower()
+        --after/--before are hidden aliases of --since/--until, and file search
+        uses --include-extensions (not --include-types).
+        """
+        output = _cli_help(*path).lower()
+        assert output
+        assert all(needle in output for needle in needles), [n for n in needles if n not in output]
 
-    def test_cli_messages_get_exists(self):
-        """'ais messages get' route exists."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["messages", "get", "--help"])
-        assert result.exit_code == 0
-        assert "session" in result.output.lower()
+    def test_cli_has_search_command(self):
+        """CLI app has 'search' command."""
+        output = _cli_help("search")
+        assert "search" in output.lower() or "pattern" in output.lower()
 
     def test_cli_extract_positional_name(self):
         """'extract' uses a positional NAME argument (not --name/-n)."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["extract", "--help"])
-        assert result.exit_code == 0
+        output = _cli_help("extract")
         # Positional arg appears as NAME or name in help, not as --name flag
-        assert "NAME" in result.output or "name" in result.output.lower()
-        assert "--name" not in result.output
-
-    def test_cli_get_command_exists(self):
-        """Root 'get' command exists."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["get", "--help"])
-        assert result.exit_code == 0
-        assert "session" in result.output.lower()
-
-    def test_cli_stats_command_exists(self):
-        """Root 'stats' command exists."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["stats", "--help"])
-        assert result.exit_code == 0
-
-    def test_cli_search_has_max_chars_for_messages(self):
-        """'search messages' or 'messages search' should have --max-chars option."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["messages", "search", "--help"])
-        assert result.exit_code == 0
-        assert "max-chars" in result.output.lower()
-
-    def test_cli_search_files_has_datetime_flags(self):
-        """File search should have --since, --until, --when flags (--after/--before are hidden aliases)."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["files", "search", "--help"])
-        assert result.exit_code == 0
-        assert "--since" in result.output
-        assert "--until" in result.output
-        assert "--when" in result.output
-
-    def test_cli_search_files_has_session_flags(self):
-        """File search should have --include-sessions and --exclude-sessions."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["files", "search", "--help"])
-        assert result.exit_code == 0
-        assert "include-sessions" in result.output.lower()
-        assert "exclude-sessions" in result.output.lower()
-
-    def test_cli_search_files_uses_include_extensions(self):
-        """File search should use --include-extensions (not --include-types)."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["files", "search", "--help"])
-        assert result.exit_code == 0
-        assert "include-extensions" in result.output.lower()
-
-    def test_cli_get_has_max_chars(self):
-        """'get' command should have --max-chars option."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["get", "--help"])
-        assert result.exit_code == 0
-        assert "max-chars" in result.output.lower()
-
-    def test_cli_get_has_format(self):
-        """'get' command should have --format option."""
-        runner = CliRunner()
-        result = runner.invoke(app, ["get", "--help"])
-        assert result.exit_code == 0
-        assert "format" in result.output.lower()
+        assert "NAME" in output or "name" in output.lower()
+        assert "--name" not in output
 
 
 # ── Fixture helpers for tmp_path-based tests ─────────────────────────────────
@@ -2014,6 +2008,21 @@ class TestEngineWithMissingDirs:
         assert stats.total_files == 0
         assert stats.total_versions == 0
 
+    def test_get_statistics_session_count_does_not_stat(self, tmp_path, monkeypatch):
+        """Undated session counting only enumerates names; no per-file stat()."""
+        import ai_session_tools.engine as engine_module
+        projects = tmp_path / "projects" / "proj"
+        projects.mkdir(parents=True)
+        for sid in ("s1", "s2"):
+            (projects / f"{sid}.jsonl").write_text("{}\n")
+
+        def no_stat(path):
+            raise AssertionError(f"unexpected stat of {path}")
+
+        monkeypatch.setattr(engine_module, "_path_stat_iso", no_stat)
+        engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "no_recovery")
+        assert engine.get_statistics().total_sessions == 2
+
     def test_search_empty_recovery_dir_returns_empty(self, tmp_path):
         (tmp_path / "recovery").mkdir()
         engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
@@ -2084,6 +2093,23 @@ class TestPrefixSessionMatching:
         msgs = engine.get_messages("ffffffff-dead-beef-0000-000000000000")
         assert msgs == []
 
+    def test_non_matching_files_are_not_opened(self, tmp_path, monkeypatch):
+        """Only files whose name starts with the prefix are read."""
+        import builtins
+        engine, session_id = self._engine_and_session(tmp_path)
+        proj = next(p for p in engine.projects_dir.iterdir() if p.is_dir())
+        (proj / "0000other-session.jsonl").write_text("{}\n")
+        opened = []
+        real_open = builtins.open
+
+        def tracking_open(file, *args, **kwargs):
+            opened.append(Path(file).name)
+            return real_open(file, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "open", tracking_open)
+        assert len(engine.get_messages(session_id[:8])) >= 2
+        assert opened == [f"{session_id}.jsonl"]
+
     def test_message_type_filter_works(self, tmp_path):
         engine, session_id = self._engine_and_session(tmp_path)
         user_msgs = engine.get_messages(session_id, message_type="user")
@@ -2123,6 +2149,32 @@ class TestCorruptJsonlHandling:
         engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
         assert engine.search_messages("anything") == []
 
+    def test_binary_jsonl_file_is_not_parsed(self, tmp_path, monkeypatch):
+        """A file with NUL bytes up front is skipped before any line is JSON-parsed."""
+        import ai_session_tools.engine as engine_module
+        projects = tmp_path / "projects" / "proj"
+        projects.mkdir(parents=True)
+        (projects / "bin-sess.jsonl").write_bytes(
+            b"\x00\x01bin-sess\n" + b'{"type": "user", "sessionId": "bin-sess"}\n'
+        )
+        parsed = []
+        monkeypatch.setattr(engine_module, "_json_loads", lambda raw: parsed.append(raw) or {})
+        engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
+        assert engine.get_messages("bin-sess") == []
+        assert engine.search_messages("bin-sess") == []
+        assert parsed == []
+
+    def test_invalid_utf8_in_content_is_replaced_not_dropped(self, tmp_path):
+        """get_messages() keeps a line with a stray invalid byte, as text-mode reads did."""
+        projects = tmp_path / "projects" / "proj"
+        projects.mkdir(parents=True)
+        line = b'{"type": "user", "sessionId": "utf8-sess", "timestamp": "2026-01-01T00:00:00",' \
+               b' "message": {"content": "caf\xe9 ok"}}\n'
+        (projects / "utf8-sess.jsonl").write_bytes(line)
+        engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
+        [msg] = engine.get_messages("utf8-sess")
+        assert msg.content == "caf\ufffd ok"
+
 
 # ── New tests: FilterSpec zero max_edits / max_size ───────────────────────────
 
@@ -2177,6 +2229,12 @@ class TestPathExpansion:
         # Should point to home dir
         assert str(engine.projects_dir).startswith(str(Path.home()))
 
+    def test_engine_constructor_expands_tilde(self):
+        """Library callers passing '~' paths get them expanded by the engine itself."""
+        engine = SessionRecoveryEngine("~/.claude/projects", "~/.claude/recovery")
+        assert engine.projects_dir == Path.home() / ".claude" / "projects"
+        assert engine.recovery_dir == Path.home() / ".claude" / "recovery"
+
     def test_get_engine_env_var_overrides_default(self, tmp_path, monkeypatch):
         """AI_SESSION_TOOLS_PROJECTS overrides the default ~/.claude/projects."""
         from ai_session_tools.cli import _get_engine as get_engine
@@ -2220,6 +2278,28 @@ class TestRegexErrorHandling:
         with pytest.raises(ValueError, match="Invalid search pattern"):
             engine.search_messages("[unclosed")
 
+    def test_literal_query_skips_regex_compile(self, tmp_path, monkeypatch):
+        """Queries with no metacharacters (spaces and '-' allowed) match as substrings.
+
+        Only the compile is skipped: a phrase with a space is still matched against
+        the joined content, not required verbatim in the raw line.
+        """
+        projects = _make_projects_dir(tmp_path)
+        engine = SessionRecoveryEngine(projects, tmp_path / "recovery")
+
+        def no_compile(pattern):
+            raise AssertionError(f"unexpected compile of {pattern!r}")
+
+        monkeypatch.setattr(engine, "_compile_pattern", no_compile)
+        assert [m.content for m in engine.search_messages("HELLO back")] == ["Hello back from assistant"]
+        assert len(engine.search_messages("python")) == 1
+        # Split across two text blocks: matched on the joined content, not dropped raw
+        (projects / "proj_uuid" / "split.jsonl").write_text(json.dumps({
+            "sessionId": "split", "type": "assistant", "timestamp": "2026-02-22T10:00:02.000Z",
+            "message": {"content": [{"type": "text", "text": "hello two"}, {"type": "text", "text": "words here"}]},
+        }) + "\n")
+        assert [m.content for m in engine.search_messages("two words")] == ["hello two words here"]
+
     def test_glob_pattern_does_not_raise(self, tmp_path):
         recovery = _make_recovery_dir(tmp_path)
         engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
@@ -2237,7 +2317,7 @@ class TestIsLongProperty:
         msg = SessionMessage(
             type=MessageType.USER,
             timestamp="2026-02-22T10:00:00Z",
-            content="x" * 501,
+            content=_X500 + "x",
             session_id="test",
         )
         assert msg.is_long is True
@@ -2246,11 +2326,34 @@ class TestIsLongProperty:
         msg = SessionMessage(
             type=MessageType.USER,
             timestamp="2026-02-22T10:00:00Z",
-            content="x" * 500,
+            content=_X500,
             session_id="test",
         )
         assert msg.is_long is False
 
+    def test_list_content_is_flattened_to_text(self):
+        """Raw content blocks are joined once; is_long measures characters, not blocks."""
+        msg = SessionMessage(
+            type=MessageType.ASSISTANT,
+            timestamp="2026-02-22T10:00:00Z",
+            content=[
+                {"type": "text", "text": "x" * 300},
+                {"type": "tool_use", "name": "Bash"},
+                {"type": "text", "text": "y" * 300},
+            ],
+            session_id="test",
+        )
+        assert msg.content == "x" * 300 + " " + "y" * 300
+        assert msg.is_long is True
+
+    def test_session_id_is_interned(self):
+        """Messages decoded from separate records share one session_id object."""
+        ids = ["".join(["sess-", "abc"]) for _ in range(2)]
+        assert ids[0] is not ids[1]
+        a, b = (SessionMessage(type=MessageType.USER, timestamp="", content="", session_id=i) for i in ids)
+        assert a.session_id is b.session_id
+        assert a.session_id == "sess-abc"
+
     def test_engine_preserves_full_content(self, tmp_path):
         """Engine no longer truncates message content to 500 chars."""
         session_id = "full-content-session"
@@ -2308,6 +2411,24 @@ class TestStatisticsGlobal:
         assert stats.largest_file == "hello.py"
         assert stats.largest_file_edits == 5  # 3 + 2 = 5
 
+    def test_total_files_and_non_version_names(self, tmp_path):
+        """Non-snapshot names in version dirs and subdirs in session dirs are not counted."""
+        recovery = tmp_path / "recovery"
+        v = recovery / "session_all_versions_sessA"
+        v.mkdir(parents=True)
+        (v / "a.py_v000001_line_3.txt").write_text("a")
+        (v / "notes.txt").write_text("not a snapshot")
+        s = recovery / "session_sessA"
+        (s / "subdir").mkdir(parents=True)
+        (s / "a.py").write_text("a")
+        (s / "b.md").write_text("b")
+
+        stats = SessionRecoveryEngine(tmp_path / "projects", recovery).get_statistics()
+
+        assert stats.total_files == 2
+        assert stats.total_versions == 1
+        assert (stats.largest_file, stats.largest_file_edits) == ("a.py", 1)
+
 
 # ── New tests: CSV formatter proper quoting ───────────────────────────────────
 
@@ -2422,6 +2543,41 @@ class TestFilterSpecEmptySetBuilders:
         assert spec.matches_extension("md") is False
 
 
+class TestFilterSpecFreeze:
+    """FilterSpec.freeze() returns a hashable snapshot usable as a cache key."""
+
+    def test_equal_specs_freeze_equal(self):
+        a = FilterSpec(min_edits=2).with_extensions(include={"py", "md"})
+        b = FilterSpec(min_edits=2).with_extensions(include={"md", "py"})
+        assert a.freeze() == b.freeze()
+        assert hash(a.freeze()) == hash(b.freeze())
+
+    def test_snapshot_unaffected_by_later_builder_calls(self):
+        spec = FilterSpec().with_extensions(include={"py"})
+        frozen = spec.freeze()
+        spec.with_extensions(include={"md"})
+        assert frozen.include_extensions == frozenset({"py"})
+        assert spec.freeze() != frozen
+
+    def test_search_results_not_memoized(self, tmp_path):
+        recovery = _make_recovery_dir(tmp_path)
+        engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
+        first = engine.search("*.py", FilterSpec(min_edits=0))
+        (recovery / "session_abc123" / "later.py").write_text("x = 1\n")
+        second = engine.search("*.py", FilterSpec(min_edits=0))
+        assert first is not second
+        assert {f.name for f in second} - {f.name for f in first} == {"later.py"}
+
+    def test_clear_cache_picks_up_new_versions(self, tmp_path):
+        recovery = _make_recovery_dir(tmp_path)
+        engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
+        assert len(engine.get_versions("hello.py")) == 2
+        (recovery / "session_all_versions_abc123" / "hello.py_v000003_line_1.txt").write_text("v3\n")
+        assert len(engine.get_versions("hello.py")) == 2  # still memoized
+        engine.clear_cache()
+        assert len(engine.get_versions("hello.py")) == 3
+
+
 # ── New tests: engine search deduplicates same filename across session dirs ───
 
 class TestEngineSearchDeduplication:
@@ -2439,6 +2595,98 @@ class TestEngineSearchDeduplication:
         assert names.count("shared.py") == 1
 
 
+class TestFilterSpecEngineAgreement:
+    """FilterSpec.__call__() and engine._apply_all_filters() keep the same per-file verdicts."""
+
+    _FILES = [
+        SessionFile(name="a.py", path="/p/a.py", location="/p/src", file_type="py",
+                    sessions=["s1"], edits=3, size_bytes=100, last_modified="2026-02-10T08:00:00"),
+        SessionFile(name="b.md", path="/p/b.md", location="/p/docs", file_type="md",
+                    sessions=["s1", "s2"], edits=0, size_bytes=5, last_modified="2026-03-01T00:00:00"),
+        SessionFile(name="c.py", path="/p/c.py", location="/p/tests", file_type="py",
+                    sessions=[], edits=12, size_bytes=0, last_modified=None),
+    ]
+
+    @pytest.mark.parametrize("kwargs", [
+        {},
+        {"include_extensions": {"py"}},
+        {"min_edits": 1, "max_edits": 5},
+        {"max_size": 0},
+        {"include_folders": {"src"}},
+        {"since": "2026-02-15"},
+        {"include_sessions": {"s2"}},
+        {"exclude_sessions": {"s2"}},
+    ])
+    def test_same_verdicts(self, tmp_path, kwargs):
+        engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
+        spec = FilterSpec(**kwargs)
+        expected = [f for f in self._FILES if engine._apply_all_filters(f, spec)]
+        assert spec(self._FILES) == expected
+
+
+class TestSearchStatReuse:
+    """The phase-1 stat pre-filter's result is reused when building SessionFile."""
+
+    def test_prefiltered_file_not_stat_twice(self, tmp_path, monkeypatch):
+        import sys
+        from pathlib import Path
+        recovery = tmp_path / "recovery"
+        d = recovery / "session_s1"
+        d.mkdir(parents=True)
+        (d / "foo.py").write_text("x = 1\n")
+        engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
+        calls = []
+        real_stat = Path.stat
+
+        def counting_stat(self, *args, **kwargs):
+            # Count only the engine's own stat calls (Path.resolve() stats internally).
+            if self.name == "foo.py" and sys._getframe(1).f_code.co_filename.endswith("engine.py"):
+                calls.append(self)
+            return real_stat(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "stat", counting_stat)
+        [result] = engine.search("foo.py", FilterSpec(min_size=1))
+        assert result.size_bytes == 6
+        assert calls == []
+
+
+class TestSearchInterning:
+    """Repeated small strings on SessionFile share one object."""
+
+    def test_file_type_is_interned(self, tmp_path):
+        recovery = tmp_path / "recovery"
+        for sess in ("session_s1", "session_s2"):
+            (recovery / sess).mkdir(parents=True)
+        (recovery / "session_s1" / "a.py").write_text("a")
+        (recovery / "session_s2" / "b.py").write_text("b")
+        engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
+        a, b = engine.search("*.py")
+        assert a.file_type == b.file_type == "py"
+        assert a.file_type is b.file_type
+
+
+class TestGlobSearchUnanchored:
+    """Glob patterns are translated with fnmatch and matched with search(), so a
+    glob's literal head may appear anywhere in the name (long-standing behaviour)."""
+
+    def test_glob_head_matches_mid_name_case_insensitively(self, tmp_path):
+        recovery = tmp_path / "recovery"
+        d = recovery / "session_s1"
+        d.mkdir(parents=True)
+        for name in ("Shared_util.py", "shared_core.py", "other_shared_x.py", "unrelated.py"):
+            (d / name).write_text("content")
+        engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
+        names = sorted(r.name for r in engine.search("SHARED_*.py"))
+        assert names == ["Shared_util.py", "other_shared_x.py", "shared_core.py"]
+
+    def test_prefix_glob_matches_later_occurrence(self, tmp_path):
+        recovery = tmp_path / "recovery"
+        (recovery / "session_s1").mkdir(parents=True)
+        (recovery / "session_s1" / "mycli.py").write_text("x")
+        engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
+        assert [r.name for r in engine.search("cli*")] == ["mycli.py"]
+
+
 # ── New tests: SessionStatistics properties ───────────────────────────────────
 
 class TestSessionStatisticsProperties:
@@ -2475,11 +2723,66 @@ class TestVersionDirsCaching:
         first = engine._version_dirs
         second = engine._version_dirs
         assert first is second
+        # Stored on the instance, so re-access is a plain attribute lookup
+        assert engine.__dict__["_version_dirs"] is first
 
     def test_version_dirs_missing_recovery_returns_empty(self, tmp_path):
         engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "no_recovery")
         assert engine._version_dirs == []
 
+    def test_version_dirs_new_engine_sees_dir_added_in_same_tick(self, tmp_path):
+        """No process-wide listing cache: a fresh engine always rescans, even when
+        the recovery dir's mtime has not moved (coarse-timestamp filesystems)."""
+        recovery = _make_recovery_dir(tmp_path)
+        mtime_ns = recovery.stat().st_mtime_ns
+        before = {d.name for d in SessionRecoveryEngine(tmp_path / "projects", recovery)._version_dirs}
+        assert "session_all_versions_new" not in before
+        (recovery / "session_all_versions_new").mkdir()
+        os.utime(recovery, ns=(mtime_ns, mtime_ns))
+        names = {d.name for d in SessionRecoveryEngine(tmp_path / "projects", recovery)._version_dirs}
+        assert "session_all_versions_new" in names
+
+
+class TestSearchMany:
+    """search_many() matches per-pattern search() results with one walk."""
+
+    def _engine(self, tmp_path):
+        recovery = _make_recovery_dir(tmp_path)
+        proj = tmp_path / "projects" / "proj"
+        proj.mkdir(parents=True)
+        _write_tool_call_jsonl(proj / "s.jsonl", "s", "cli.py", "/home/user/cli.py", tool_name="Edit")
+        return SessionRecoveryEngine(tmp_path / "projects", recovery)
+
+    def test_matches_individual_searches(self, tmp_path):
+        patterns = ["*", "*.py", "*.md", "cli.*", "nothing*"]
+        engine = self._engine(tmp_path)
+        batched = engine.search_many(patterns)
+        fresh = SessionRecoveryEngine(engine.projects_dir, engine.recovery_dir)
+        for pattern in patterns:
+            assert [f.name for f in batched[pattern]] == [f.name for f in fresh.search(pattern)]
+        assert {f.name for f in batched["*.py"]} == {"hello.py", "cli.py"}
+
+    def test_rejects_bad_pattern_before_walking(self, tmp_path, monkeypatch):
+        engine = self._engine(tmp_path)
+        monkeypatch.setattr(engine, "search", lambda *a, **k: pytest.fail("walked before validating"))
+        with pytest.raises(ValueError):
+            engine.search_many(["*.py", "(unclosed"])
+
+
+class TestFileToolCallsCaching:
+    """_file_tool_calls cached_property scans JSONL once; repeated search() reuses it."""
+
+    def test_repeated_search_reuses_scan(self, tmp_path):
+        projects = tmp_path / "projects" / "proj"
+        projects.mkdir(parents=True)
+        _write_tool_call_jsonl(projects / "s.jsonl", "s", "cli.py", "/home/user/cli.py")
+        engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
+        first = engine.search("cli.py")
+        calls = engine._file_tool_calls
+        second = engine.search("cli.py")
+        assert engine._file_tool_calls is calls
+        assert [f.name for f in first] == [f.name for f in second] == ["cli.py"]
+
 
 class TestGetMessagesTargetedGlob:
     """get_messages only opens JSONL files matching the session prefix."""
@@ -2511,6 +2814,28 @@ class TestGetMessagesTargetedGlob:
         assert len(msgs) == 1
         assert msgs[0].content == "hello from A"
 
+    def test_iter_all_jsonl_matches_glob_for_hidden_and_non_jsonl_entries(self, tmp_path):
+        """scandir discovery keeps pathlib glob's behaviour: dot-prefixed dirs and
+        .jsonl files are included; non-.jsonl files and top-level strays are not."""
+        projects = tmp_path / "projects"
+        (projects / "proj").mkdir(parents=True)
+        (projects / ".hidden-proj").mkdir()
+        for name in ("abc.jsonl", "abd.jsonl", ".tmp.jsonl", "notes.txt"):
+            (projects / "proj" / name).write_text("{}")
+        (projects / ".hidden-proj" / "abc.jsonl").write_text("{}")
+        (projects / "stray.jsonl").write_text("{}")
+        engine = SessionRecoveryEngine(projects, tmp_path / "recovery")
+        found = sorted((proj, p.name) for proj, p, _ in engine._iter_all_jsonl())
+        assert found == sorted((d.name, f.name) for d in projects.glob("*") if d.is_dir() for f in d.glob("*.jsonl"))
+        assert (".hidden-proj", "abc.jsonl") in found and ("proj", ".tmp.jsonl") in found
+        assert sorted(p.name for _, p, _ in engine._iter_all_jsonl(session_id_prefix="abc")) == ["abc.jsonl", "abc.jsonl"]
+
+    def test_statistics_total_files_counts_dotfiles(self, tmp_path):
+        recovery = _make_recovery_dir(tmp_path)
+        (recovery / "session_abc123" / ".env").write_text("X=1")
+        engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
+        assert engine.get_statistics().total_files == 3
+
 
 class TestSearchMessagesLiteralPreFilter:
     """Literal query and equivalent regex return identical results (pre-filter has no false negatives)."""
@@ -2543,6 +2868,155 @@ class TestSearchMessagesLiteralPreFilter:
         results = engine.search_messages("quick")
         assert len(results) == 1
 
+    def test_literal_phrase_spanning_text_blocks(self, tmp_path):
+        """_extract_content() joins text blocks with a space, so a phrase can span
+        two blocks; the raw-line pre-filter must not require the whole phrase."""
+        engine = self._make_engine(tmp_path, [{"type": "text", "text": "hello two"}, {"type": "text", "text": "words here"}])
+        assert [m.content for m in engine.search_messages("two words")] == ["hello two words here"]
+        assert [m.content for m in engine.search_messages("two words", fixed_strings=True)] == ["hello two words here"]
+
+    def test_literal_query_raw_run_extraction(self):
+        from ai_session_tools.engine import _longest_raw_query_run
+        assert _longest_raw_query_run("two words") == "words"
+        assert _longest_raw_query_run('say "hi" there') == "there"
+        assert _longest_raw_query_run("caf\u00e9 au lait") == "lait"
+        assert _longest_raw_query_run("is") == "is"
+        assert _longest_raw_query_run("  ") is None
+
+    def test_regex_required_literal_extraction(self):
+        from ai_session_tools.engine import _required_literals
+        assert _required_literals("qu.ck") == ("qu",)
+        assert _required_literals("(Brown)\\s+fox") == ("brown",)
+        assert _required_literals("(abc|def)x") == ("x",)
+        assert _required_literals("a?b*") is None
+        # i/s, spaces and JSON-escaped characters never end up in the raw-line literal
+        assert _required_literals("is this") == ("th",)
+
+    def test_alternation_yields_one_literal_per_branch(self):
+        from ai_session_tools.engine import _required_literals
+        assert _required_literals("zebra|Panther|wolf") == ("zebra", "panther", "wolf")
+        assert _required_literals("(zebra|panther)") == ("zebra", "panther")
+        # a branch without a literal means any line could match
+        assert _required_literals("zebra|.+") is None
+
+    def test_alternation_pre_filter_no_false_negatives(self, tmp_path):
+        engine = self._make_engine(tmp_path, "The Quick Brown Fox")
+        assert len(engine.search_messages("zebra|FOX|wolf")) == 1
+        assert engine.search_messages("zebra|wolf") == []
+
+    def test_regex_pre_filter_no_false_negatives(self, tmp_path):
+        engine = self._make_engine(tmp_path, "The Quick Brown Fox")
+        assert len(engine.search_messages("BROWN\\s+f.x")) == 1
+        assert len(engine.search_messages("(red|brown) fox")) == 1
+        assert engine.search_messages("brown\\s+dog") == []
+
+    def test_regex_pre_filter_skips_parsing_lines_without_literal(self, tmp_path, monkeypatch):
+        from ai_session_tools import engine as engine_mod
+        engine = self._make_engine(tmp_path, "the quick brown fox")
+        calls = []
+        real_loads = engine_mod._json_loads
+        monkeypatch.setattr(engine_mod, "_json_loads", lambda s: calls.append(s) or real_loads(s))
+        assert engine.search_messages("zebra.*stripes") == []
+        assert calls == []
+
+
+class TestSearchMessagesParallelScan:
+    """search_messages returns the same ordered results whether or not files are scanned on the thread pool."""
+
+    def test_scan_files_preserves_order(self, tmp_path, monkeypatch):
+        from ai_session_tools import engine as engine_mod
+        paths = []
+        for i in range(12):
+            paths.append(tmp_path / f"f{i}.jsonl")
+            paths[-1].write_text("x" * (i + 1))
+        monkeypatch.setattr(engine_mod, "_PARALLEL_SCAN_MIN_BYTES", 1)
+        sizes = [p.stat().st_size for p in paths]
+        assert list(engine_mod._scan_files(paths, lambda p: p.stat().st_size)) == sizes
+        assert list(engine_mod._scan_files(paths[:1], lambda p: p.name)) == ["f0.jsonl"]
+
+    def test_scan_files_close_cancels_queued_work(self, tmp_path, monkeypatch):
+        from ai_session_tools import engine as engine_mod
+        paths = [tmp_path / f"f{i}.jsonl" for i in range(_PARALLEL_SCAN_MAX_WORKERS * 3)]
+        for p in paths:
+            p.write_text("x")
+        monkeypatch.setattr(engine_mod, "_PARALLEL_SCAN_MIN_BYTES", 1)
+        started, release = [], threading.Event()
+
+        def fn(p):
+            started.append(p)
+            if p != paths[0]:
+                release.wait(5)
+            return p
+
+        scan = engine_mod._scan_files(paths, fn)
+        assert next(scan) == paths[0]
+        started_close = time.monotonic()
+        scan.close()  # returns without waiting for the blocked workers
+        release.set()
+        assert time.monotonic() - started_close < 2
+        assert len(started) <= _PARALLEL_SCAN_MAX_WORKERS + 1
+
+    def test_pool_gated_on_total_bytes(self, tmp_path, monkeypatch):
+        from ai_session_tools import engine as engine_mod
+        paths = [tmp_path / "a.jsonl", tmp_path / "b.jsonl"]
+        for p in paths:
+            p.write_text("x" * 10)
+        assert engine_mod._total_size_at_least(paths, 20)
+        assert not engine_mod._total_size_at_least([*paths, tmp_path / "missing"], 21)
+        threads = []
+        monkeypatch.setattr(engine_mod, "_PARALLEL_SCAN_MIN_FILES", 2)
+        monkeypatch.setattr(engine_mod, "_PARALLEL_SCAN_MIN_BYTES", 21)
+        list(engine_mod._scan_files(paths, lambda p: threads.append(threading.current_thread())))
+        assert threads == [threading.main_thread()] * 2
+
+    def test_few_files_skip_the_size_check(self, tmp_path, monkeypatch):
+        from ai_session_tools import engine as engine_mod
+        paths = [tmp_path / f"f{i}.jsonl" for i in range(engine_mod._PARALLEL_SCAN_MIN_FILES - 1)]
+        monkeypatch.setattr(engine_mod, "_total_size_at_least", lambda *a: pytest.fail("stat'ed a short file list"))
+        assert list(engine_mod._scan_files(paths, lambda p: p.name)) == [p.name for p in paths]
+
+    def test_threaded_results_match_sequential(self, tmp_path, monkeypatch):
+        from ai_session_tools import engine as engine_mod
+        proj = tmp_path / "projects" / "proj"
+        proj.mkdir(parents=True)
+        for i in range(8):
+            lines = [
+                json.dumps({"sessionId": f"s{i}", "type": "user", "timestamp": f"2026-01-0{i + 1}T00:00:0{j}Z",
+                            "message": {"content": f"needle {i}-{j}"}})
+                for j in range(3)
+            ]
+            (proj / f"s{i}.jsonl").write_text("\n".join(lines) + "\n")
+        engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
+        monkeypatch.setattr(engine_mod, "_PARALLEL_SCAN_MIN_BYTES", 1)
+        threaded = [m.content for m in engine.search_messages("needle")]
+        monkeypatch.setattr(engine_mod, "_PARALLEL_SCAN_MIN_BYTES", 1 << 62)
+        sequential = [m.content for m in engine.search_messages("needle")]
+        assert len(threaded) == 24
+        assert threaded == sequential
+
+    @pytest.mark.parametrize("min_bytes, max_sniffed", [(1 << 62, 1), (1, _PARALLEL_SCAN_MAX_WORKERS + 1)], ids=["sequential", "pool"])
+    def test_iter_search_messages_stops_at_first_hit(self, tmp_path, monkeypatch, min_bytes, max_sniffed):
+        from ai_session_tools import engine as engine_mod
+        monkeypatch.setattr(engine_mod, "_PARALLEL_SCAN_MIN_BYTES", min_bytes)
+        proj = tmp_path / "projects" / "proj"
+        proj.mkdir(parents=True)
+        for i in range(_PARALLEL_SCAN_MAX_WORKERS * 3):
+            (proj / f"s{i}.jsonl").write_text(json.dumps({
+                "sessionId": f"s{i}", "type": "user", "timestamp": "2026-01-01T00:00:00Z",
+                "message": {"content": f"needle {i}"},
+            }) + "\n")
+        engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
+        sniffed = []
+        real_looks_binary = engine_mod._looks_binary
+        monkeypatch.setattr(engine_mod, "_looks_binary", lambda f: sniffed.append(f) or real_looks_binary(f))
+        first = next(engine._iter_search_messages("needle"), None)
+        assert first is not None and first.content.startswith("needle")
+        # Only the files already in flight were opened; the rest stay unread
+        assert len(sniffed) <= max_sniffed
+        assert [m.content for m in engine._iter_search_messages("needle")] == [
+            m.content for m in engine.search_messages("needle")
+        ]
+
 
 class TestLocationIsString:
     """SessionFile.location is a plain str; engine search results have location == 'recovery'."""
@@ -2562,15 +3036,19 @@ class TestLocationIsString:
             assert isinstance(r.location, str)
             assert r.location == "recovery"
 
-    def test_file_location_not_in_public_api(self):
+    def test_location_case_preserved_but_filter_case_insensitive(self):
+        r = SessionFile(name="x.py", path="/x.py", location="Worktree/SRC")
+        assert r.location == "Worktree/SRC"
+        assert SearchFilter().by_location("src")([r]) == [r]
+        assert "_location_lower" not in r.to_dict()
+
+    def test_file_location_not_in_public_api(self, pkg):
         """FileLocation enum was removed; it is no longer accessible from the package."""
-        import ai_session_tools
-        assert not hasattr(ai_session_tools, "FileLocation")
+        assert not hasattr(pkg, "FileLocation")
 
-    def test_file_type_not_in_public_api(self):
+    def test_file_type_not_in_public_api(self, pkg):
         """FileType enum was removed; it is no longer accessible from the package."""
-        import ai_session_tools
-        assert not hasattr(ai_session_tools, "FileType")
+        assert not hasattr(pkg, "FileType")
 
 
 # ── Part C tests: original-path extraction ────────────────────────────────────
@@ -2621,6 +3099,17 @@ class TestGetOriginalPath:
         engine = SessionRecoveryEngine(tmp_path / "no_projects", tmp_path / "recovery")
         assert engine.get_original_path("cli.py") is None
 
+    def test_invalid_utf8_elsewhere_in_line_still_found(self, tmp_path):
+        """A stray non-UTF-8 byte in the record does not hide the recorded path."""
+        projects = tmp_path / "projects" / "proj"
+        projects.mkdir(parents=True)
+        expected = "/home/user/myproject/cli.py"
+        _write_tool_call_jsonl(projects / "utf8-session.jsonl", "utf8-session", "cli.py", expected)
+        raw = (projects / "utf8-session.jsonl").read_bytes()
+        (projects / "utf8-session.jsonl").write_bytes(raw.replace(b"utf8-session", b"utf8-s\xe9ssion", 1))
+        engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
+        assert engine.get_original_path("cli.py") == expected
+
     def test_edit_tool_also_found(self, tmp_path):
         projects = tmp_path / "projects" / "proj"
         projects.mkdir(parents=True)
@@ -2686,6 +3175,35 @@ class TestGetOriginalPathMultipleVersions:
         engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
         assert engine.get_original_path("cli.py") == second_path
 
+    def test_repeated_lookup_reads_session_files_once(self, tmp_path, monkeypatch):
+        from ai_session_tools import engine as engine_mod
+        proj = tmp_path / "projects" / "proj"
+        proj.mkdir(parents=True)
+        _write_tool_call_jsonl(proj / "s.jsonl", "s", "cli.py", "/home/user/cli.py")
+        engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
+        sniffed = []
+        real_looks_binary = engine_mod._looks_binary
+        monkeypatch.setattr(engine_mod, "_looks_binary", lambda f: sniffed.append(f) or real_looks_binary(f))
+        assert engine.get_original_path("cli.py") == "/home/user/cli.py"
+        assert engine.get_original_path("cli.py") == "/home/user/cli.py"
+        assert engine.get_original_path("missing.py") is None
+        assert engine.get_original_path("missing.py") is None
+        assert len(sniffed) == 2
+
+    def test_lines_without_path_keys_are_not_parsed(self, tmp_path, monkeypatch):
+        from ai_session_tools import engine as engine_mod
+        proj = tmp_path / "projects" / "proj"
+        proj.mkdir(parents=True)
+        (proj / "s.jsonl").write_text(json.dumps({
+            "sessionId": "s", "type": "user", "message": {"content": "please fix cli.py"},
+        }) + "\n")
+        engine = SessionRecoveryEngine(tmp_path / "projects", tmp_path / "recovery")
+        parsed = []
+        real_loads = engine_mod._loads_line_bytes
+        monkeypatch.setattr(engine_mod, "_loads_line_bytes", lambda b: parsed.append(b) or real_loads(b))
+        assert engine.get_original_path("cli.py") is None
+        assert parsed == []
+
 
 class TestResolveOutputPath:
     """_resolve_output_path returns target unchanged when it doesn't exist; appends .recovered suffix otherwise."""
@@ -2717,6 +3235,24 @@ class TestResolveOutputPath:
         result = _resolve_output_path(tmp_path / "cli.py")
         assert result == tmp_path / "cli.recovered_2.py"
 
+    def test_gap_in_numbering_returns_smallest_free(self, tmp_path):
+        from ai_session_tools.cli import _resolve_output_path
+        for name in ("cli.py", "cli.recovered.py", "cli.recovered_1.py", "cli.recovered_3.py"):
+            (tmp_path / name).write_text("x")
+        assert _resolve_output_path(tmp_path / "cli.py") == tmp_path / "cli.recovered_2.py"
+
+    def test_many_conflicts_do_not_stat_each_candidate(self, tmp_path, monkeypatch):
+        from ai_session_tools.cli import _resolve_output_path
+        (tmp_path / "cli.py").write_text("original")
+        (tmp_path / "cli.recovered.py").write_text("r0")
+        for i in range(1, 30):
+            (tmp_path / f"cli.recovered_{i}.py").write_text(f"r{i}")
+        probed = []
+        real_exists = Path.exists
+        monkeypatch.setattr(Path, "exists", lambda self, *a, **k: probed.append(self) or real_exists(self, *a, **k))
+        assert _resolve_output_path(tmp_path / "cli.py") == tmp_path / "cli.recovered_30.py"
+        assert len(probed) == 1
+
 
 class TestExtractToOriginalPath:
     """_do_extract with output_dir=None restores to the original recorded path."""
@@ -2853,7 +3389,6 @@ class TestClaudeDirCliFlag:
         # Create minimal structure so search doesn't crash
         (tmp_path / "projects").mkdir()
         (tmp_path / "recovery").mkdir()
-        runner = CliRunner()
         result = runner.invoke(app, ["--claude-dir", str(tmp_path), "files", "search"])
         # Should use tmp_path as claude dir; engine.projects_dir should be tmp_path/projects
         # The command should succeed (exit 0) or show "No files found"
@@ -3099,7 +3634,6 @@ class TestPositionalArgExtract:
 
     def test_positional_name_works(self, tmp_path):
         import ai_session_tools.cli as cli_module
-        runner = CliRunner()
         # Set up tmp recovery dir
         recovery = _make_recovery_dir(tmp_path)
         import os
@@ -3126,7 +3660,6 @@ class TestPositionalArgExtract:
 
     def test_no_name_flag_accepted(self):
         """--name flag should no longer be accepted."""
-        runner = CliRunner()
         result = runner.invoke(app, ["extract", "--help"])
         assert result.exit_code == 0
         assert "--name" not in result.output
@@ -3136,7 +3669,6 @@ class TestPositionalArgHistory:
     """CLI history command uses positional NAME argument."""
 
     def test_history_help_shows_positional(self):
-        runner = CliRunner()
         result = runner.invoke(app, ["files", "history", "--help"])
         assert result.exit_code == 0
         assert "--name" not in result.output
@@ -3769,7 +4301,8 @@ class TestConfigPath:
             "AI_SESSION_TOOLS_CONFIG": str(custom_cfg),
         })
         assert result.exit_code == 0
-        assert "my_config.json" in result.output
+        # Long tmp paths (e.g. under pytest-xdist workers) may be wrapped by Rich.
+        assert "my_config.json" in result.output.replace("\n", "")
 
 
 class TestConfigShow:
@@ -9902,6 +10435,19 @@ class TestAPIClarity:
         result = sf([f1, f2])
         assert f1 in result and f2 not in result
 
+    def test_search_filter_by_location_pattern_multiple_globs(self):
+        """Several include/exclude globs combine as ANY-of, case-insensitively."""
+        from ai_session_tools.filters import SearchFilter
+        from ai_session_tools import SessionFile
+        files = [
+            SessionFile(name="a.py", path="/P/Src/a.py", location="/P/Src/a.py"),
+            SessionFile(name="b.py", path="/p/lib/b.py", location="/p/lib/b.py"),
+            SessionFile(name="c.py", path="/p/lib/tests/c.py", location="/p/lib/tests/c.py"),
+            SessionFile(name="d.py", path="/p/docs/d.py", location="/p/docs/d.py"),
+        ]
+        sf = SearchFilter().by_location_pattern(include=["*/src/*", "*/LIB/*"], exclude=["*/test*/*"])
+        assert [f.name for f in sf(files)] == ["a.py", "b.py"]
+
     def test_location_matcher_not_in_all(self):
         """LocationMatcher is deprecated and NOT in __all__."""
         import ai_session_tools as aise
@@ -15419,6 +15965,43 @@ class TestToolUseOnlyFilter:
         assert len(tool_msgs) < len(all_msgs) or len(all_msgs) == 0
 
 
+class TestParseVersionSuffix:
+    """_parse_version_suffix() slices version/line numbers, falling back to the regex."""
+
+    @pytest.mark.parametrize("name, base, expected", [
+        ("hello.py_v000001_line_5.txt", "hello.py", (1, 5)),
+        ("hello.py_v000123_line_4567.txt", "hello.py", (123, 4567)),
+        ("a_v1.py_v000002_line_9.txt", "a_v1.py", (2, 9)),
+        ("hello.py_vX_line_5.txt", "hello.py", None),
+        ("hello.py_v000001_line_5.txt", "hello", (1, 5)),
+    ])
+    def test_parse(self, name, base, expected):
+        from ai_session_tools.engine import _parse_version_suffix
+        assert _parse_version_suffix(name, len(base)) == expected
+
+    def test_extract_final_picks_highest_existing_version(self, tmp_path):
+        recovery = _make_recovery_dir(tmp_path)
+        engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
+        versions = engine.get_versions("hello.py")
+        assert len(versions) >= 2
+        newest = max(versions)
+        out = engine.extract_final("hello.py", tmp_path / "out")
+        assert out.read_text() == engine._version_file_path("hello.py", newest).read_text()
+
+    def test_extract_final_tie_matches_last_ascending_version(self, tmp_path):
+        """Two sessions share version 1: the winner is the last in ascending stable order."""
+        recovery = tmp_path / "recovery"
+        for sid in ("aaa", "bbb"):
+            d = recovery / f"session_all_versions_{sid}"
+            d.mkdir(parents=True)
+            (d / "x.py_v000001_line_1.txt").write_text(f"from {sid}\n")
+        engine = SessionRecoveryEngine(tmp_path / "projects", recovery)
+        expected = engine._version_file_path("x.py", sorted(engine.get_versions("x.py"))[-1]).read_text()
+        out = engine.extract_final("x.py", tmp_path / "out")
+        assert out.read_text() == expected
+        assert engine.extract_all("x.py", tmp_path / "all")[-1].read_text() == expected
+
+
 class TestResolveVersionPaths:
     """Tests for P9: _resolve_version_paths() helper."""
 